@@ -3,4 +3,96 @@ ABOUT_TXT = \
     Made by Jaylin Wylie Mayes - 2025
     
     \t- For my wife and her passions  <3
-    """
\ No newline at end of file
+    """
+
+
+DOCS = """\
+Skein Care is a native desktop application designed to help catalog thread skeins for embroidery, cross-stitch, and other fiber arts.
+
+- Each skein has a counter that you can adjust using the + and - buttons, or by entering a value directly.
+- Sort collection by Brand, SKU, Name, or Count using the Sort menu.
+- Sort by Hue, Lightness, Saturation, or Color Gradient to keep similar colors next to each other.
+- Use the search bar to quickly find skeins by SKU or name.
+
+### Adding New Skeins
+1. Click on "File" > "Add New Skein"
+2. Enter details:
+   - Brand: The manufacturer of the skein
+   - SKU: The product code/number
+   - Name: The color name or description
+   - Colors: Add one or more colors for the skein
+3. Click "OK" to add the skein to your catalog
+
+### Pattern Shortages
+1. Click on "File" > "Pattern Shortages..."
+2. Import a pattern's floss list as CSV, or paste it, one "sku,count", "brand,sku,count", "sku,name,count" or "brand,sku,name,count" per line; lines that are not floss entries are counted beside the pattern name
+3. Queue several patterns to reserve stock across projects in queue order
+4. Click "Export Shopping List..." to save the skeins you still need to buy
+
+### Color Cards
+- "File" > "Export Color Card..." renders the current view, your library, the whole catalog or one brand
+- Save as a single PNG image or a printable multi-page A4 PDF
+
+### Usage Analytics
+- Every count change is logged with a timestamp in "usage.bin"
+- "File" > "Usage Analytics..." shows how fast each skein is used and when it is projected to run out
+- Usage and counts are those of the active profile, under "All Profiles" every profile is added up
+
+### Equivalents
+- The edit dialog lists the closest skeins in every other brand with their color difference (\u0394E)
+- Equivalents are cached in "catalogs/_equivalents.json" and rebuilt for a brand when its catalog file changes
+
+### Undo
+- "Edit" > "Undo" (Ctrl+Z) and "Redo" (Ctrl+Y) revert count changes and skein adds, edits and deletes
+- Quick repeated clicks on the same counter are undone as one step
+
+### Running Twice
+- Launching Skein Care while it is already open brings the open window forward instead
+- Launch arguments are passed to the open window:
+  - `--search TEXT` searches for a SKU or name
+  - `--adjust BRAND:SKU:DELTA` changes a count, e.g. `--adjust DMC:310:-1`
+  - `--set BRAND:SKU:COUNT` sets a count
+- Scripts and barcode scanner helpers can send counts without starting the app: connect to the port in "instance.lock" and send one JSON request per line with the token from that file, e.g. `{"token": "...", "op": "adjust", "brand": "DMC", "sku": "310", "delta": 1}`, optionally with a "profile"
+
+### Gradient Planner
+- "File" > "Gradient Planner..." finds a smooth run of skeins from one color to another, e.g. for shading
+- Enter the first and last skein and click "Plan", the skeins in between are chosen so each step changes color by a similar amount
+- Tick "Only skeins I own" to use only skeins with a count above zero in the current profile
+- Set "Steps" to choose how many steps the run takes, at 0 it takes about one step per 8 ΔE
+
+### Profiles
+- Keep separate counts for different locations or projects with "Profile" > "New Profile..."
+- Pick a profile in the "Profile" menu to switch to it instantly
+- "All Profiles" shows the total of every profile and cannot be edited
+- "Profile" > "Transfer Skeins..." moves skeins from one profile to another in one step, and can be undone
+
+### Data Management
+- Click on any skein in your collection to edit its details
+- Skein counts for every profile are saved in "profiles.json", an older "library.json" becomes the "Default" profile
+- Skein catalogs are stored in the "catalogs"
+- User preferences are saved in "defaults.json"
+"""
+
+LICENCE = """\
+MIT License
+
+Copyright (c) 2025 Jaylin Wylie Mayes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
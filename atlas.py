@@ -0,0 +1,288 @@
+import os
+import struct
+import threading
+import zlib
+
+from color import skein_text_color
+from swatch import PLACEHOLDER_COLOR, band_row
+
+BACKGROUND = b'\xff\xff\xff'
+
+LINE_SPACING = 4
+BLOCK_SPACING = 20
+
+
+class Glyph:
+    """A character rendered once and stored as runs of covered pixels for each row."""
+
+    def __init__(self, width: int, height: int, rows: list[list[tuple[int, int]]]):
+        self.width = width
+        self.height = height
+        self.rows = rows
+
+
+class AtlasLayout:
+    def __init__(self, tile_width: int = 280, tile_height: int = 380, gutter: int = 10, columns: int = 12):
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.gutter = gutter
+        self.columns = columns
+
+    @property
+    def cell_width(self) -> int:
+        return self.tile_width + self.gutter
+
+    @property
+    def cell_height(self) -> int:
+        return self.tile_height + self.gutter
+
+    @property
+    def width(self) -> int:
+        return self.columns * self.cell_width + self.gutter
+
+
+class AtlasComposer:
+    def __init__(self, layout: AtlasLayout, glyphs: dict[str, Glyph]):
+        self.layout = layout
+        self.glyphs = glyphs
+        self.line_height = max((glyph.height for glyph in glyphs.values()), default=0)
+        self.text_widths: dict[str, int] = {}
+
+    def text_width(self, text: str) -> int:
+        width = self.text_widths.get(text)
+        if width is None:
+            width = self.text_widths[text] = sum(self.glyphs[char].width for char in text if char in self.glyphs)
+        return width
+
+    def draw_text(self, buffer: bytearray, stride: int, x: int, y: int, text: str, color: bytes, right: int | None = None):
+        # Characters that would cross `right` are dropped, so long words stay inside their tile
+        for char in text:
+            glyph = self.glyphs.get(char)
+            if glyph is None:
+                continue
+            if right is not None and x + glyph.width > right:
+                break
+            for row, runs in enumerate(glyph.rows):
+                offset = (y + row) * stride + x * 3
+                for start, end in runs:
+                    buffer[offset + start * 3:offset + end * 3] = color * (end - start)
+            x += glyph.width
+
+    def draw_tile(self, buffer: bytearray, stride: int, x: int, y: int, skein):
+        width = self.layout.tile_width
+        height = self.layout.tile_height
+        colors = skein.color or [PLACEHOLDER_COLOR]
+
+        # One row of colour bands, copied down the tile
+        row = band_row(colors, width)
+        for line in range(y, y + height):
+            offset = line * stride + x * 3
+            buffer[offset:offset + width * 3] = row
+
+        # Text block laid out like ColorDisplayPanel: brand words, SKU, name words
+        text_color = bytes(skein_text_color(colors))
+        brand_lines = skein.brand.upper().split()
+        name_lines = skein.name.split()
+        line_step = self.line_height + LINE_SPACING
+        title_height = len(brand_lines) * line_step - LINE_SPACING
+        name_height = len(name_lines) * line_step - LINE_SPACING
+        total_height = title_height + self.line_height + name_height + 2 * BLOCK_SPACING
+
+        current_y = y + max(0, (height - total_height) // 2)
+        blocks = [(brand_lines, line_step), ([skein.sku], self.line_height + BLOCK_SPACING), (name_lines, line_step)]
+        for block, (lines, step) in enumerate(blocks):
+            for text in lines:
+                if current_y + self.line_height > y + height:
+                    return
+                text_x = x + max(0, (width - self.text_width(text)) // 2)
+                self.draw_text(buffer, stride, text_x, current_y, text, text_color, x + width)
+                current_y += step
+            if block == 0:
+                current_y += BLOCK_SPACING - LINE_SPACING
+
+    def strips(self, skeins: list):
+        """Yield (rows of pixels, row count) one row of tiles at a time."""
+        layout = self.layout
+        stride = layout.width * 3
+        for start in range(0, len(skeins), layout.columns):
+            buffer = bytearray(BACKGROUND * (layout.width * layout.cell_height))
+            for column, skein in enumerate(skeins[start:start + layout.columns]):
+                self.draw_tile(buffer, stride, layout.gutter + column * layout.cell_width, layout.gutter, skein)
+            yield buffer, layout.cell_height
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+
+def write_png(path: str, width: int, height: int, strips, cancelled=None) -> bool:
+    """Stream RGB strips into a PNG, compressing as rows arrive. Returns False if cancelled."""
+    compressor = zlib.compressobj(6)
+    stride = width * 3
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(_png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        for buffer, rows in strips:
+            if cancelled and cancelled():
+                return False
+            data = b''.join(b'\x00' + buffer[row * stride:(row + 1) * stride] for row in range(rows))
+            compressed = compressor.compress(data)
+            if compressed:
+                f.write(_png_chunk(b'IDAT', compressed))
+        f.write(_png_chunk(b'IDAT', compressor.flush()))
+        f.write(_png_chunk(b'IEND', b''))
+    return True
+
+
+class PdfWriter:
+    """Minimal PDF with one full-page image per page, written as each page is finished."""
+
+    def __init__(self, path: str, page_width: float, page_height: float, dpi: int):
+        self.file = open(path, 'wb')
+        self.page_width = page_width
+        self.page_height = page_height
+        self.scale = 72 / dpi
+        self.offsets: dict[int, int] = {}
+        self.page_ids: list[int] = []
+        # 1 is the catalog and 2 the page tree, both written last
+        self.next_id = 3
+        self.file.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+    def write_object(self, object_id: int, body: bytes, stream: bytes | None = None):
+        self.offsets[object_id] = self.file.tell()
+        self.file.write(b'%d 0 obj\n' % object_id + body)
+        if stream is not None:
+            self.file.write(b'\nstream\n' + stream + b'\nendstream')
+        self.file.write(b'\nendobj\n')
+
+    def add_page(self, width: int, height: int, strips):
+        image_id, content_id, page_id = self.next_id, self.next_id + 1, self.next_id + 2
+        self.next_id += 3
+
+        compressor = zlib.compressobj(6)
+        image = b''.join(compressor.compress(bytes(buffer[:rows * width * 3])) for buffer, rows in strips) + compressor.flush()
+        self.write_object(image_id, b'<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB '
+                                    b'/BitsPerComponent 8 /Filter /FlateDecode /Length %d >>' % (width, height, len(image)), image)
+
+        # Centred horizontally and anchored to the top of the page
+        draw_width = width * self.scale
+        draw_height = height * self.scale
+        content = b'q %.2f 0 0 %.2f %.2f %.2f cm /Im0 Do Q' % (draw_width, draw_height, (self.page_width - draw_width) / 2,
+                                                              self.page_height - draw_height - (self.page_width - draw_width) / 2)
+        self.write_object(content_id, b'<< /Length %d >>' % len(content), content)
+
+        self.write_object(page_id, b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] /Resources << /XObject << /Im0 %d 0 R >> >> '
+                                   b'/Contents %d 0 R >>' % (self.page_width, self.page_height, image_id, content_id))
+        self.page_ids.append(page_id)
+
+    def close(self):
+        try:
+            kids = b' '.join(b'%d 0 R' % page_id for page_id in self.page_ids)
+            self.write_object(2, b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(self.page_ids)))
+            self.write_object(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+
+            # A page that failed partway leaves ids with no object, listed as free
+            xref_offset = self.file.tell()
+            self.file.write(b'xref\n0 %d\n0000000000 65535 f \n' % self.next_id)
+            for object_id in range(1, self.next_id):
+                offset = self.offsets.get(object_id)
+                self.file.write(b'%010d 00000 n \n' % offset if offset is not None else b'0000000000 00001 f \n')
+            self.file.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (self.next_id, xref_offset))
+        finally:
+            self.file.close()
+
+
+# A4 in points, printed at 200 DPI
+PAGE_WIDTH = 595.28
+PAGE_HEIGHT = 841.89
+PAGE_DPI = 200
+
+
+class AtlasJob(threading.Thread):
+    """Compose a colour card for the given skeins and write it as PNG or PDF off the UI thread.
+
+    `progress` is called with (done, total) and `finished` with an error message or None,
+    both from the worker thread.
+    """
+
+    def __init__(self, skeins: list, path: str, glyphs: dict[str, Glyph], progress=None, finished=None):
+        super().__init__(daemon=True)
+        self.skeins = skeins
+        self.path = path
+        self.glyphs = glyphs
+        self.progress = progress
+        self.finished = finished
+        self.cancel_event = threading.Event()
+        self.layout = AtlasLayout()
+        self.done = 0
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def report(self, strips):
+        for buffer, rows in strips:
+            yield buffer, rows
+            self.done = min(len(self.skeins), self.done + self.layout.columns)
+            if self.progress:
+                self.progress(self.done, len(self.skeins))
+
+    def run(self):
+        error = None
+        # Written beside the chosen file and swapped in, so a cancelled or failed export leaves nothing behind
+        temporary = self.path + ".tmp"
+        saved = False
+        try:
+            if self.path.lower().endswith('.pdf'):
+                self.write_pdf(temporary)
+            else:
+                self.write_png(temporary)
+            if not self.cancel_event.is_set():
+                os.replace(temporary, self.path)
+                saved = True
+        except Exception as e:
+            error = str(e)
+        if not saved:
+            if self.cancel_event.is_set():
+                error = "Cancelled"
+            try:
+                os.remove(temporary)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Error removing temporary color card: {e}")
+        if self.finished:
+            self.finished(error)
+
+    def write_png(self, path: str):
+        self.layout.columns = max(1, min(self.layout.columns, len(self.skeins)))
+        composer = AtlasComposer(self.layout, self.glyphs)
+        tile_rows = -(-len(self.skeins) // self.layout.columns)
+        height = tile_rows * self.layout.cell_height + self.layout.gutter
+
+        # The bottom gutter is emitted as a last strip of background
+        def strips():
+            yield from self.report(composer.strips(self.skeins))
+            yield bytearray(BACKGROUND * (self.layout.width * self.layout.gutter)), self.layout.gutter
+
+        write_png(path, self.layout.width, height, strips(), self.cancel_event.is_set)
+
+    def write_pdf(self, path: str):
+        page_width = int(PAGE_WIDTH / 72 * PAGE_DPI)
+        page_height = int(PAGE_HEIGHT / 72 * PAGE_DPI)
+        self.layout.columns = max(1, (page_width - self.layout.gutter) // self.layout.cell_width)
+        composer = AtlasComposer(self.layout, self.glyphs)
+        rows_per_page = max(1, (page_height - self.layout.gutter) // self.layout.cell_height)
+        per_page = rows_per_page * self.layout.columns
+
+        pdf = PdfWriter(path, PAGE_WIDTH, PAGE_HEIGHT, PAGE_DPI)
+        try:
+            for start in range(0, len(self.skeins), per_page):
+                if self.cancel_event.is_set():
+                    break
+                page_skeins = self.skeins[start:start + per_page]
+                strips = list(self.report(composer.strips(page_skeins)))
+                rows = sum(count for _, count in strips) + self.layout.gutter
+                strips.append((bytearray(BACKGROUND * (self.layout.width * self.layout.gutter)), self.layout.gutter))
+                pdf.add_page(self.layout.width, rows, strips)
+        finally:
+            pdf.close()
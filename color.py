@@ -0,0 +1,528 @@
+"""Colour science on whole arrays of colours at once.
+
+Every conversion takes a sequence of colours (lists, tuples or a NumPy array of shape (n, 3))
+and returns plain lists, so callers never need to know which backend ran. NumPy is used when
+it is installed, otherwise a pure Python kernel with the same formulas gives the same results.
+Nothing here imports wx.
+
+Run `python color.py` to check both kernels against reference values and benchmark them.
+"""
+import math
+from typing import NamedTuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# D65 reference white
+WHITE_X = 0.95047
+WHITE_Y = 1.0
+WHITE_Z = 1.08883
+
+# Linear sRGB to XYZ and back
+RGB_TO_XYZ = ((0.4124564, 0.3575761, 0.1804375),
+              (0.2126729, 0.7151522, 0.0721750),
+              (0.0193339, 0.1191920, 0.9503041))
+XYZ_TO_RGB = ((3.2404542, -1.5371385, -0.4985314),
+              (-0.9692660, 1.8760108, 0.0415560),
+              (0.0556434, -0.2040259, 1.0572252))
+
+LAB_EPSILON = 216 / 24389
+LAB_KAPPA = 24389 / 27
+
+# Below this CIELAB chroma a colour reads as grey and its hue is meaningless
+ACHROMATIC_CHROMA = 8.0
+
+HILBERT_BITS = 8
+
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+
+
+class ColorKeys(NamedTuple):
+    hue: float
+    lightness: float
+    saturation: float
+    gradient: int
+
+
+class PythonKernel:
+    name = "python"
+
+    @staticmethod
+    def srgb_to_linear(rgbs) -> list[list[float]]:
+        result = []
+        for rgb in rgbs:
+            row = []
+            for value in rgb[:3]:
+                value = value / 255
+                row.append(value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4)
+            result.append(row)
+        return result
+
+    @staticmethod
+    def linear_to_srgb(linears) -> list[list[float]]:
+        return [[255 * (value * 12.92 if value <= 0.0031308 else 1.055 * value ** (1 / 2.4) - 0.055) for value in linear]
+                for linear in linears]
+
+    @staticmethod
+    def _matrix(rows, matrix) -> list[list[float]]:
+        (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = matrix
+        return [[m00 * x + m01 * y + m02 * z, m10 * x + m11 * y + m12 * z, m20 * x + m21 * y + m22 * z]
+                for x, y, z in rows]
+
+    def linear_to_xyz(self, linears) -> list[list[float]]:
+        return self._matrix(linears, RGB_TO_XYZ)
+
+    def xyz_to_linear(self, xyzs) -> list[list[float]]:
+        return self._matrix(xyzs, XYZ_TO_RGB)
+
+    @staticmethod
+    def xyz_to_lab(xyzs) -> list[list[float]]:
+        result = []
+        for x, y, z in xyzs:
+            fx, fy, fz = (t ** (1 / 3) if t > LAB_EPSILON else (LAB_KAPPA * t + 16) / 116
+                          for t in (x / WHITE_X, y / WHITE_Y, z / WHITE_Z))
+            result.append([116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)])
+        return result
+
+    @staticmethod
+    def lab_to_xyz(labs) -> list[list[float]]:
+        result = []
+        for l, a, b in labs:
+            fy = (l + 16) / 116
+            fx = fy + a / 500
+            fz = fy - b / 200
+            x, y, z = (f ** 3 if f ** 3 > LAB_EPSILON else (116 * f - 16) / LAB_KAPPA for f in (fx, fy, fz))
+            result.append([x * WHITE_X, y * WHITE_Y, z * WHITE_Z])
+        return result
+
+    def rgb_to_lab(self, rgbs) -> list[list[float]]:
+        return self.xyz_to_lab(self.linear_to_xyz(self.srgb_to_linear(rgbs)))
+
+    def lab_to_rgb(self, labs) -> list[list[float]]:
+        return self.linear_to_srgb(self.xyz_to_linear(self.lab_to_xyz(labs)))
+
+    @staticmethod
+    def lab_to_lch(labs) -> list[list[float]]:
+        return [[l, math.hypot(a, b), math.degrees(math.atan2(b, a)) % 360] for l, a, b in labs]
+
+    @staticmethod
+    def lch_to_lab(lchs) -> list[list[float]]:
+        return [[l, c * math.cos(math.radians(h)), c * math.sin(math.radians(h))] for l, c, h in lchs]
+
+    @staticmethod
+    def relative_luminance(rgbs) -> list[float]:
+        _, (r_weight, g_weight, b_weight), _ = RGB_TO_XYZ
+        return [r_weight * r + g_weight * g + b_weight * b for r, g, b in PythonKernel.srgb_to_linear(rgbs)]
+
+    @staticmethod
+    def delta_e76(labs1, labs2) -> list[float]:
+        return [math.sqrt((l1 - l2) ** 2 + (a1 - a2) ** 2 + (b1 - b2) ** 2)
+                for (l1, a1, b1), (l2, a2, b2) in zip(labs1, labs2)]
+
+    @staticmethod
+    def delta_e2000(labs1, labs2) -> list[float]:
+        result = []
+        for (l1, a1, b1), (l2, a2, b2) in zip(labs1, labs2):
+            c_mean = (math.hypot(a1, b1) + math.hypot(a2, b2)) / 2
+            g = 0.5 * (1 - math.sqrt(c_mean ** 7 / (c_mean ** 7 + 25 ** 7)))
+            a1p = (1 + g) * a1
+            a2p = (1 + g) * a2
+            c1p = math.hypot(a1p, b1)
+            c2p = math.hypot(a2p, b2)
+            h1p = math.degrees(math.atan2(b1, a1p)) % 360
+            h2p = math.degrees(math.atan2(b2, a2p)) % 360
+
+            dl = l2 - l1
+            dc = c2p - c1p
+            chroma_product = c1p * c2p
+            dh = h2p - h1p
+            if chroma_product == 0:
+                dh = 0.0
+            elif dh > 180:
+                dh -= 360
+            elif dh < -180:
+                dh += 360
+            d_big_h = 2 * math.sqrt(chroma_product) * math.sin(math.radians(dh / 2))
+
+            l_mean = (l1 + l2) / 2
+            cp_mean = (c1p + c2p) / 2
+            h_mean = h1p + h2p
+            if chroma_product != 0:
+                if abs(h1p - h2p) <= 180:
+                    h_mean = h_mean / 2
+                elif h_mean < 360:
+                    h_mean = (h_mean + 360) / 2
+                else:
+                    h_mean = (h_mean - 360) / 2
+
+            t = (1 - 0.17 * math.cos(math.radians(h_mean - 30)) + 0.24 * math.cos(math.radians(2 * h_mean))
+                 + 0.32 * math.cos(math.radians(3 * h_mean + 6)) - 0.20 * math.cos(math.radians(4 * h_mean - 63)))
+            d_theta = 30 * math.exp(-((h_mean - 275) / 25) ** 2)
+            r_c = 2 * math.sqrt(cp_mean ** 7 / (cp_mean ** 7 + 25 ** 7))
+            s_l = 1 + 0.015 * (l_mean - 50) ** 2 / math.sqrt(20 + (l_mean - 50) ** 2)
+            s_c = 1 + 0.045 * cp_mean
+            s_h = 1 + 0.015 * cp_mean * t
+            r_t = -math.sin(math.radians(2 * d_theta)) * r_c
+
+            result.append(math.sqrt((dl / s_l) ** 2 + (dc / s_c) ** 2 + (d_big_h / s_h) ** 2
+                                    + r_t * (dc / s_c) * (d_big_h / s_h)))
+        return result
+
+
+class NumpyKernel:
+    name = "numpy"
+
+    @staticmethod
+    def _array(values):
+        return numpy.asarray(values, dtype=numpy.float64).reshape(-1, 3)
+
+    def srgb_to_linear(self, rgbs) -> list[list[float]]:
+        return self._srgb_to_linear(self._array(rgbs)).tolist()
+
+    @staticmethod
+    def _srgb_to_linear(rgbs):
+        values = rgbs / 255
+        return numpy.where(values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4)
+
+    def linear_to_srgb(self, linears) -> list[list[float]]:
+        return self._linear_to_srgb(self._array(linears)).tolist()
+
+    @staticmethod
+    def _linear_to_srgb(values):
+        # Clamp the unused branch so negative values do not warn
+        safe = numpy.maximum(values, 0.0031308)
+        return 255 * numpy.where(values <= 0.0031308, values * 12.92, 1.055 * safe ** (1 / 2.4) - 0.055)
+
+    def linear_to_xyz(self, linears) -> list[list[float]]:
+        return self._matrix(self._array(linears), RGB_TO_XYZ).tolist()
+
+    def xyz_to_linear(self, xyzs) -> list[list[float]]:
+        return self._matrix(self._array(xyzs), XYZ_TO_RGB).tolist()
+
+    @staticmethod
+    def _matrix(rows, matrix):
+        # Written out per term so the sums happen in the same order as the Python kernel
+        (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = matrix
+        x, y, z = rows[:, 0], rows[:, 1], rows[:, 2]
+        return numpy.stack([m00 * x + m01 * y + m02 * z, m10 * x + m11 * y + m12 * z, m20 * x + m21 * y + m22 * z], axis=1)
+
+    def xyz_to_lab(self, xyzs) -> list[list[float]]:
+        return self._xyz_to_lab(self._array(xyzs)).tolist()
+
+    @staticmethod
+    def _xyz_to_lab(xyzs):
+        t = xyzs / numpy.array([WHITE_X, WHITE_Y, WHITE_Z])
+        f = numpy.where(t > LAB_EPSILON, numpy.maximum(t, LAB_EPSILON) ** (1 / 3), (LAB_KAPPA * t + 16) / 116)
+        fx, fy, fz = f[:, 0], f[:, 1], f[:, 2]
+        return numpy.stack([116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)], axis=1)
+
+    def lab_to_xyz(self, labs) -> list[list[float]]:
+        return self._lab_to_xyz(self._array(labs)).tolist()
+
+    @staticmethod
+    def _lab_to_xyz(labs):
+        fy = (labs[:, 0] + 16) / 116
+        f = numpy.stack([fy + labs[:, 1] / 500, fy, fy - labs[:, 2] / 200], axis=1)
+        cubed = f ** 3
+        t = numpy.where(cubed > LAB_EPSILON, cubed, (116 * f - 16) / LAB_KAPPA)
+        return t * numpy.array([WHITE_X, WHITE_Y, WHITE_Z])
+
+    def rgb_to_lab(self, rgbs) -> list[list[float]]:
+        return self._xyz_to_lab(self._matrix(self._srgb_to_linear(self._array(rgbs)), RGB_TO_XYZ)).tolist()
+
+    def lab_to_rgb(self, labs) -> list[list[float]]:
+        return self._linear_to_srgb(self._matrix(self._lab_to_xyz(self._array(labs)), XYZ_TO_RGB)).tolist()
+
+    def lab_to_lch(self, labs) -> list[list[float]]:
+        return self._lab_to_lch(self._array(labs)).tolist()
+
+    @staticmethod
+    def _lab_to_lch(labs):
+        a, b = labs[:, 1], labs[:, 2]
+        return numpy.stack([labs[:, 0], numpy.hypot(a, b), numpy.degrees(numpy.arctan2(b, a)) % 360], axis=1)
+
+    def lch_to_lab(self, lchs) -> list[list[float]]:
+        lchs = self._array(lchs)
+        h = numpy.radians(lchs[:, 2])
+        return numpy.stack([lchs[:, 0], lchs[:, 1] * numpy.cos(h), lchs[:, 1] * numpy.sin(h)], axis=1).tolist()
+
+    def relative_luminance(self, rgbs) -> list[float]:
+        linear = self._srgb_to_linear(self._array(rgbs))
+        _, (r_weight, g_weight, b_weight), _ = RGB_TO_XYZ
+        return (r_weight * linear[:, 0] + g_weight * linear[:, 1] + b_weight * linear[:, 2]).tolist()
+
+    def delta_e76(self, labs1, labs2) -> list[float]:
+        diff = self._array(labs1) - self._array(labs2)
+        return numpy.sqrt(diff[:, 0] ** 2 + diff[:, 1] ** 2 + diff[:, 2] ** 2).tolist()
+
+    def delta_e2000(self, labs1, labs2) -> list[float]:
+        labs1 = self._array(labs1)
+        labs2 = self._array(labs2)
+        l1, a1, b1 = labs1[:, 0], labs1[:, 1], labs1[:, 2]
+        l2, a2, b2 = labs2[:, 0], labs2[:, 1], labs2[:, 2]
+
+        c_mean = (numpy.hypot(a1, b1) + numpy.hypot(a2, b2)) / 2
+        g = 0.5 * (1 - numpy.sqrt(c_mean ** 7 / (c_mean ** 7 + 25 ** 7)))
+        a1p = (1 + g) * a1
+        a2p = (1 + g) * a2
+        c1p = numpy.hypot(a1p, b1)
+        c2p = numpy.hypot(a2p, b2)
+        h1p = numpy.degrees(numpy.arctan2(b1, a1p)) % 360
+        h2p = numpy.degrees(numpy.arctan2(b2, a2p)) % 360
+
+        dl = l2 - l1
+        dc = c2p - c1p
+        chroma_product = c1p * c2p
+        dh = h2p - h1p
+        dh = numpy.where(dh > 180, dh - 360, numpy.where(dh < -180, dh + 360, dh))
+        dh = numpy.where(chroma_product == 0, 0.0, dh)
+        d_big_h = 2 * numpy.sqrt(chroma_product) * numpy.sin(numpy.radians(dh / 2))
+
+        l_mean = (l1 + l2) / 2
+        cp_mean = (c1p + c2p) / 2
+        h_sum = h1p + h2p
+        h_mean = numpy.where(numpy.abs(h1p - h2p) <= 180, h_sum / 2,
+                             numpy.where(h_sum < 360, (h_sum + 360) / 2, (h_sum - 360) / 2))
+        h_mean = numpy.where(chroma_product == 0, h_sum, h_mean)
+
+        t = (1 - 0.17 * numpy.cos(numpy.radians(h_mean - 30)) + 0.24 * numpy.cos(numpy.radians(2 * h_mean))
+             + 0.32 * numpy.cos(numpy.radians(3 * h_mean + 6)) - 0.20 * numpy.cos(numpy.radians(4 * h_mean - 63)))
+        d_theta = 30 * numpy.exp(-((h_mean - 275) / 25) ** 2)
+        r_c = 2 * numpy.sqrt(cp_mean ** 7 / (cp_mean ** 7 + 25 ** 7))
+        s_l = 1 + 0.015 * (l_mean - 50) ** 2 / numpy.sqrt(20 + (l_mean - 50) ** 2)
+        s_c = 1 + 0.045 * cp_mean
+        s_h = 1 + 0.015 * cp_mean * t
+        r_t = -numpy.sin(numpy.radians(2 * d_theta)) * r_c
+
+        return numpy.sqrt((dl / s_l) ** 2 + (dc / s_c) ** 2 + (d_big_h / s_h) ** 2
+                          + r_t * (dc / s_c) * (d_big_h / s_h)).tolist()
+
+
+python_kernel = PythonKernel()
+numpy_kernel = NumpyKernel() if numpy is not None else None
+kernel = numpy_kernel or python_kernel
+
+
+def srgb_to_linear(rgbs) -> list[list[float]]:
+    return kernel.srgb_to_linear(rgbs)
+
+
+def linear_to_srgb(linears) -> list[list[float]]:
+    return kernel.linear_to_srgb(linears)
+
+
+def linear_to_xyz(linears) -> list[list[float]]:
+    return kernel.linear_to_xyz(linears)
+
+
+def xyz_to_linear(xyzs) -> list[list[float]]:
+    return kernel.xyz_to_linear(xyzs)
+
+
+def xyz_to_lab(xyzs) -> list[list[float]]:
+    return kernel.xyz_to_lab(xyzs)
+
+
+def lab_to_xyz(labs) -> list[list[float]]:
+    return kernel.lab_to_xyz(labs)
+
+
+def lab_to_lch(labs) -> list[list[float]]:
+    return kernel.lab_to_lch(labs)
+
+
+def lch_to_lab(lchs) -> list[list[float]]:
+    return kernel.lch_to_lab(lchs)
+
+
+def rgb_to_lab(rgbs) -> list[list[float]]:
+    return kernel.rgb_to_lab(rgbs)
+
+
+def lab_to_rgb(labs) -> list[list[float]]:
+    """Unclamped, unrounded 0-255 sRGB values."""
+    return kernel.lab_to_rgb(labs)
+
+
+def relative_luminance(rgbs) -> list[float]:
+    return kernel.relative_luminance(rgbs)
+
+
+def delta_e76(labs1, labs2) -> list[float]:
+    return kernel.delta_e76(labs1, labs2)
+
+
+def delta_e2000(labs1, labs2) -> list[float]:
+    return kernel.delta_e2000(labs1, labs2)
+
+
+def contrast_text_color(luminance: float) -> tuple[int, int, int]:
+    """Black or white, whichever has the higher WCAG contrast ratio against the given luminance."""
+    return BLACK if (luminance + 0.05) / 0.05 >= 1.05 / (luminance + 0.05) else WHITE
+
+
+def text_colors(rgbs) -> list[tuple[int, int, int]]:
+    return [contrast_text_color(luminance) for luminance in relative_luminance(rgbs)]
+
+
+def skein_text_color(colors) -> tuple[int, int, int]:
+    """Text colour for a swatch made of one or more bands, from their mean luminance."""
+    if not colors:
+        return BLACK
+    luminances = relative_luminance(colors)
+    return contrast_text_color(sum(luminances) / len(luminances))
+
+
+def representative_labs(color_lists) -> list[tuple[float, float, float]]:
+    """The mean of each skein's bands in CIELAB, converting every band of every skein in one call.
+
+    This is the single colour used wherever a multi-colour skein needs one.
+    """
+    color_lists = [colors or [[200, 200, 200]] for colors in color_lists]
+    labs = rgb_to_lab([color for colors in color_lists for color in colors])
+
+    result = []
+    start = 0
+    for colors in color_lists:
+        count = len(colors)
+        bands = labs[start:start + count]
+        start += count
+        result.append((sum(lab[0] for lab in bands) / count,
+                       sum(lab[1] for lab in bands) / count,
+                       sum(lab[2] for lab in bands) / count))
+    return result
+
+
+def hilbert_index(coords, bits: int = HILBERT_BITS) -> int:
+    """Position of an integer point along a Hilbert curve (Skilling's transpose algorithm)."""
+    x = list(coords)
+    n = len(x)
+    m = 1 << (bits - 1)
+
+    # Inverse undo
+    q = m
+    while q > 1:
+        p = q - 1
+        for i in range(n):
+            if x[i] & q:
+                x[0] ^= p
+            else:
+                t = (x[0] ^ x[i]) & p
+                x[0] ^= t
+                x[i] ^= t
+        q >>= 1
+
+    # Gray encode
+    for i in range(1, n):
+        x[i] ^= x[i - 1]
+    t = 0
+    q = m
+    while q > 1:
+        if x[n - 1] & q:
+            t ^= q - 1
+        q >>= 1
+    for i in range(n):
+        x[i] ^= t
+
+    # Interleave the transposed bits into a single index
+    index = 0
+    for bit in range(bits - 1, -1, -1):
+        for i in range(n):
+            index = (index << 1) | ((x[i] >> bit) & 1)
+    return index
+
+
+def _quantize(value: float, low: float, high: float, bits: int) -> int:
+    top = (1 << bits) - 1
+    return min(top, max(0, int((value - low) / (high - low) * top + 0.5)))
+
+
+def color_keys(lab) -> ColorKeys:
+    lightness, a, b = lab
+    chroma = math.hypot(a, b)
+    hue = math.degrees(math.atan2(b, a)) % 360
+
+    # Greys sort ahead of every hue, dark to light
+    hue_key = hue if chroma >= ACHROMATIC_CHROMA else lightness - 101
+
+    gradient = hilbert_index((_quantize(lightness, 0, 100, HILBERT_BITS),
+                              _quantize(a, -128, 128, HILBERT_BITS),
+                              _quantize(b, -128, 128, HILBERT_BITS)))
+    return ColorKeys(hue_key, lightness, chroma, gradient)
+
+
+# Sharma, Wu & Dalal (2005) CIEDE2000 test pairs
+DE2000_REFERENCE = [
+    ((50.0, 2.6772, -79.7751), (50.0, 0.0, -82.7485), 2.0425),
+    ((50.0, 3.1571, -77.2803), (50.0, 0.0, -82.7485), 2.8615),
+    ((50.0, 2.8361, -74.0200), (50.0, 0.0, -82.7485), 3.4412),
+    ((50.0, 0.0, 0.0), (50.0, -1.0, 2.0), 2.3669),
+    ((50.0, 2.5, 0.0), (73.0, 25.0, -18.0), 27.1492),
+    ((60.2574, -34.0099, 36.2677), (60.4626, -34.1751, 39.4387), 1.2644),
+    ((63.0109, -31.0961, -5.8663), (62.8187, -29.7946, -4.0864), 1.2630),
+    ((2.0776, 0.0795, -1.1350), (0.9033, -0.0636, -0.5514), 0.9082),
+]
+
+# sRGB to CIELAB (D65) reference values
+LAB_REFERENCE = [
+    ((255, 255, 255), (100.0, 0.0, 0.0)),
+    ((0, 0, 0), (0.0, 0.0, 0.0)),
+    ((255, 0, 0), (53.2408, 80.0925, 67.2032)),
+    ((0, 255, 0), (87.7347, -86.1827, 83.1793)),
+    ((0, 0, 255), (32.2970, 79.1875, -107.8602)),
+]
+
+
+def _self_check():
+    import random
+    import time
+
+    kernels = [python_kernel] + ([numpy_kernel] if numpy_kernel else [])
+    for active in kernels:
+        for (lab1, lab2, expected) in DE2000_REFERENCE:
+            value = active.delta_e2000([lab1], [lab2])[0]
+            assert abs(value - expected) < 1e-4, f"{active.name} delta E2000 {value} != {expected}"
+        for rgb, expected in LAB_REFERENCE:
+            lab = active.rgb_to_lab([rgb])[0]
+            assert all(abs(got - want) < 1e-3 for got, want in zip(lab, expected)), f"{active.name} Lab {lab} != {expected}"
+            back = active.lab_to_rgb([lab])[0]
+            assert all(abs(got - want) < 1e-3 for got, want in zip(back, rgb)), f"{active.name} round trip {back} != {rgb}"
+        print(f"{active.name}: reference values ok")
+
+    rng = random.Random(1)
+    rgbs = [[rng.randrange(256) for _ in range(3)] for _ in range(100000)]
+    labs = python_kernel.rgb_to_lab(rgbs[:1000])
+    shuffled = labs[1:] + labs[:1]
+
+    if numpy_kernel:
+        pairs = [
+            ("rgb_to_lab", lambda k: k.rgb_to_lab(rgbs[:1000])),
+            ("lab_to_rgb", lambda k: k.lab_to_rgb(labs)),
+            ("lab_to_lch", lambda k: k.lab_to_lch(labs)),
+            ("lab_to_xyz", lambda k: k.lab_to_xyz(labs)),
+            ("relative_luminance", lambda k: k.relative_luminance(rgbs[:1000])),
+            ("delta_e76", lambda k: k.delta_e76(labs, shuffled)),
+            ("delta_e2000", lambda k: k.delta_e2000(labs, shuffled)),
+        ]
+        for name, call in pairs:
+            flat = numpy.ravel(numpy.asarray(call(python_kernel)) - numpy.asarray(call(numpy_kernel)))
+            worst = float(numpy.max(numpy.abs(flat)))
+            assert worst < 1e-9, f"{name} kernels differ by {worst}"
+        print("python and numpy kernels agree")
+
+    for active in kernels:
+        start = time.perf_counter()
+        converted = active.rgb_to_lab(rgbs)
+        elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        active.delta_e2000(converted, converted[1:] + converted[:1])
+        de_elapsed = time.perf_counter() - start
+        print(f"{active.name}: rgb_to_lab {len(rgbs) / elapsed:,.0f} colours/s, "
+              f"delta_e2000 {len(rgbs) / de_elapsed:,.0f} pairs/s")
+
+
+if __name__ == "__main__":
+    _self_check()
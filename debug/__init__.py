@@ -0,0 +1,8 @@
+import os
+
+# Debug instrumentation is only wired in when launched with SKEINCARE_DEBUG=1,
+# otherwise the decorators hand back the original functions untouched.
+ENABLED = os.environ.get("SKEINCARE_DEBUG", "") == "1"
+
+from .latency import tracer, timed, timing
+from .memory import memory, track
@@ -0,0 +1,107 @@
+import bisect
+import contextlib
+import functools
+import os
+import time
+import traceback
+from collections import deque
+
+import debug
+
+# Histogram bucket upper bounds in milliseconds, the last bucket is open ended
+BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class PathStats:
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * (len(BUCKETS) + 1)
+
+
+class LatencyTracer:
+    def __init__(self, capacity: int = 4096, slow_ms: float = 100.0):
+        # Recent (path, milliseconds) samples, oldest dropped first
+        self.samples: deque[tuple[str, float]] = deque(maxlen=capacity)
+        self.paths: dict[str, PathStats] = {}
+        self.slow_ms = slow_ms
+
+    def record(self, path: str, elapsed_ms: float, stack_skip: int = 1):
+        self.samples.append((path, elapsed_ms))
+        stats = self.paths.get(path)
+        if stats is None:
+            stats = self.paths[path] = PathStats()
+        stats.calls += 1
+        stats.total += elapsed_ms
+        stats.max = max(stats.max, elapsed_ms)
+        stats.histogram[bisect.bisect_left(BUCKETS, elapsed_ms)] += 1
+
+        if elapsed_ms > self.slow_ms:
+            # Drop the tracer's own frames from the logged stack
+            stack = ''.join(traceback.format_stack()[:-stack_skip])
+            print(f"Slow {path}: {elapsed_ms:.1f} ms\n{stack}")
+
+    def percentiles(self, path: str) -> tuple[float, float]:
+        """p50 and p95 over the samples still in the ring buffer"""
+        values = sorted(elapsed for sample_path, elapsed in self.samples if sample_path == path)
+        if not values:
+            return 0.0, 0.0
+        return values[len(values) // 2], values[min(len(values) - 1, int(len(values) * 0.95))]
+
+    def report(self) -> list[tuple[str, int, float, float, float]]:
+        """(path, calls, p50, p95, max) for every traced path, slowest first"""
+        rows = []
+        for path, stats in self.paths.items():
+            p50, p95 = self.percentiles(path)
+            rows.append((path, stats.calls, p50, p95, stats.max))
+        rows.sort(key=lambda row: row[3], reverse=True)
+        return rows
+
+    def histogram_text(self, path: str) -> str:
+        stats = self.paths[path]
+        labels = [f"<{bound}" for bound in BUCKETS] + [f">{BUCKETS[-1]}"]
+        return "  ".join(f"{label}:{count}" for label, count in zip(labels, stats.histogram) if count)
+
+    def reset(self):
+        self.samples.clear()
+        self.paths.clear()
+
+
+tracer = LatencyTracer(slow_ms=float(os.environ.get("SKEINCARE_SLOW_MS", 100)))
+
+
+def timed(path: str):
+    """Decorator recording each call's duration under the given path."""
+    def decorator(func):
+        if not debug.ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.record(path, (time.perf_counter() - start) * 1000, stack_skip=2)
+        return wrapper
+    return decorator
+
+
+@contextlib.contextmanager
+def _timing(path: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        tracer.record(path, (time.perf_counter() - start) * 1000, stack_skip=3)
+
+
+_disabled = contextlib.nullcontext()
+
+
+def timing(path: str):
+    """Context manager recording the duration of its block under the given path."""
+    if not debug.ENABLED:
+        return _disabled
+    return _timing(path)
@@ -0,0 +1,131 @@
+import gc
+import sys
+import time
+import tracemalloc
+import weakref
+
+import debug
+
+
+def deep_sizeof(obj, seen: set | None = None) -> int:
+    """Approximate bytes held by a structure of dicts, lists, tuples, sets and plain objects."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__') and not isinstance(obj, type):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+class Checkpoint:
+    def __init__(self, name: str, counts: dict[str, tuple[int, int, int]], snapshot: tracemalloc.Snapshot):
+        self.name = name
+        self.time = time.time()
+        # kind -> (live, destroyed but still referenced, approximate bytes)
+        self.counts = counts
+        self.snapshot = snapshot
+
+
+class MemoryTracker:
+    """Weak registries of long-lived objects plus tracemalloc checkpoints.
+
+    Objects are registered with `track` as they are created. Only weak references are held,
+    so anything still listed after a garbage collection is being kept alive somewhere.
+    """
+
+    def __init__(self):
+        self.enabled = debug.ENABLED
+        self.registries: dict[str, weakref.WeakSet] = {}
+        self.sizers: dict[str, object] = {}
+        self.checkpoints: list[Checkpoint] = []
+
+    def enable(self):
+        """Start tracking from a script or test, whatever SKEINCARE_DEBUG says."""
+        self.enabled = True
+
+    def track(self, kind: str, obj, sizer=None):
+        if not self.enabled:
+            return
+        registry = self.registries.get(kind)
+        if registry is None:
+            registry = self.registries[kind] = weakref.WeakSet()
+            if sizer:
+                self.sizers[kind] = sizer
+        registry.add(obj)
+
+    def counts(self) -> dict[str, tuple[int, int, int]]:
+        result = {}
+        for kind, registry in self.registries.items():
+            sizer = self.sizers.get(kind, deep_sizeof)
+            live = destroyed = total = 0
+            for obj in list(registry):
+                # wx objects are falsy once the C++ side is destroyed
+                if not obj:
+                    destroyed += 1
+                    continue
+                live += 1
+                total += sizer(obj)
+            result[kind] = (live, destroyed, total)
+        return result
+
+    def checkpoint(self, name: str) -> Checkpoint:
+        gc.collect()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+        checkpoint = Checkpoint(name, self.counts(), tracemalloc.take_snapshot())
+        self.checkpoints.append(checkpoint)
+        return checkpoint
+
+    @staticmethod
+    def growth(before: Checkpoint, after: Checkpoint) -> dict[str, tuple[int, int]]:
+        """Kinds whose live or destroyed-but-referenced counts grew, as (live delta, destroyed delta)."""
+        result = {}
+        for kind, (live, destroyed, _) in after.counts.items():
+            old_live, old_destroyed, _ = before.counts.get(kind, (0, 0, 0))
+            if live > old_live or destroyed > old_destroyed:
+                result[kind] = (live - old_live, destroyed - old_destroyed)
+        return result
+
+    @staticmethod
+    def top_allocations(before: Checkpoint, after: Checkpoint, limit: int = 15) -> list[str]:
+        stats = after.snapshot.compare_to(before.snapshot, 'lineno')
+        return [str(stat) for stat in stats[:limit]]
+
+    def report(self, model=None) -> str:
+        lines = [f"{'Kind':<24}{'Live':>8}{'Destroyed':>11}{'Approx KB':>12}"]
+        for kind, (live, destroyed, total) in sorted(self.counts().items()):
+            lines.append(f"{kind:<24}{live:>8}{destroyed:>11}{total / 1024:>12.1f}")
+
+        if model is not None:
+            lines.append("")
+            lines.append(f"{'catalog dicts':<24}{'':>19}{deep_sizeof(model.catalog.skeins) / 1024:>12.1f}")
+            lines.append(f"{'profile counts':<24}{'':>19}{deep_sizeof(model.profiles.profiles) / 1024:>12.1f}")
+
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            lines.append("")
+            lines.append(f"Traced Python memory: {current / 1024:.1f} KB (peak {peak / 1024:.1f} KB)")
+
+        if len(self.checkpoints) >= 2:
+            before, after = self.checkpoints[-2], self.checkpoints[-1]
+            lines.append("")
+            lines.append(f"Since checkpoint '{before.name}' -> '{after.name}':")
+            for kind, (live, destroyed) in self.growth(before, after).items():
+                lines.append(f"  {kind}: {live:+d} live, {destroyed:+d} destroyed but referenced")
+            lines.extend(f"  {line}" for line in self.top_allocations(before, after))
+        return "\n".join(lines)
+
+
+memory = MemoryTracker()
+
+
+def track(kind: str, obj, sizer=None):
+    memory.track(kind, obj, sizer)
@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+
+from nearest import ColorIndex
+
+CACHE_VERSION = 1
+
+
+class EquivalentsTable:
+    """Closest skeins in every other brand for each skein in the catalog, cached in the catalogs folder.
+
+    Results are stored per (brand, other brand) pair and a pair is only recomputed when
+    either brand's catalog file has changed since it was cached.
+    """
+
+    def __init__(self, catalog, catalogs_dir: str = "catalogs", per_brand: int = 3):
+        self.catalog = catalog
+        self.catalogs_dir = catalogs_dir
+        self.per_brand = per_brand
+        # Leading underscore keeps main.py from loading the cache as a brand
+        self.cache_file = os.path.join(catalogs_dir, "_equivalents.json")
+        self.signatures: dict[str, list[int] | None] = {}
+        self.pairs: dict[str, dict[str, list[list]]] = {}
+        # Guards the queued snapshot and running flag of the background refresh
+        self.lock = threading.Lock()
+        self.queued: dict | None = None
+        self.running = False
+        self.load()
+
+    @staticmethod
+    def pair_key(brand: str, other: str) -> str:
+        return f"{brand}>{other}"
+
+    def brand_signature(self, brand: str) -> list[int] | None:
+        try:
+            stat = os.stat(os.path.join(self.catalogs_dir, f"{brand}.json"))
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def load(self):
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION and data.get('per_brand') == self.per_brand:
+                self.signatures = data.get('signatures', {})
+                self.pairs = data.get('pairs', {})
+        except Exception as e:
+            print(f"Error loading equivalents cache: {e}")
+
+    def save(self):
+        data = {
+            'version': CACHE_VERSION,
+            'per_brand': self.per_brand,
+            'signatures': self.signatures,
+            'pairs': self.pairs,
+        }
+        try:
+            with open(self.cache_file, 'w') as f:
+                json.dump(data, f)
+        except Exception as e:
+            print(f"Error saving equivalents cache: {e}")
+
+    def snapshot(self) -> dict[str, list[tuple[str, tuple]]]:
+        """Copy of each brand's (sku, lab) pairs, taken on the thread that owns the catalog."""
+        return {brand: [(sku, skein.lab) for sku, skein in list(skeins.items())]
+                for brand, skeins in list(self.catalog.skeins.items())}
+
+    def refresh(self, snapshot: dict[str, list[tuple[str, tuple]]] | None = None) -> int:
+        """Recompute every brand pair whose catalog files changed. Returns the number of pairs rebuilt.
+
+        Works on a snapshot of the catalog, never the live one, so the UI thread can keep editing it.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot()
+        brands = list(snapshot)
+        signatures = {brand: self.brand_signature(brand) for brand in brands}
+        changed = {brand for brand in brands if self.signatures.get(brand) != signatures[brand]}
+
+        # Built as a new dict and swapped in, so lookup never sees it half updated
+        pairs = {key: value for key, value in self.pairs.items() if key.split('>', 1)[0] in signatures
+                 and key.split('>', 1)[1] in signatures}
+        stale = [(brand, other) for brand in brands for other in brands
+                 if brand != other and (brand in changed or other in changed or self.pair_key(brand, other) not in pairs)]
+        if not stale and self.signatures == signatures and len(pairs) == len(self.pairs):
+            return 0
+
+        indexes: dict[str, ColorIndex] = {}
+        for brand, other in stale:
+            if other not in indexes:
+                indexes[other] = ColorIndex(snapshot[other])
+            index = indexes[other]
+            pairs[self.pair_key(brand, other)] = {
+                sku: [[match, round(distance, 2)] for distance, match in index.nearest(lab, self.per_brand)]
+                for sku, lab in snapshot[brand]
+            }
+
+        self.pairs = pairs
+        self.signatures = signatures
+        self.save()
+        return len(stale)
+
+    def refresh_async(self):
+        """Refresh on a worker thread. Requests made while one runs are folded into a single rerun."""
+        snapshot = self.snapshot()
+        with self.lock:
+            self.queued = snapshot
+            if self.running:
+                return
+            self.running = True
+        threading.Thread(target=self._refresh_worker, daemon=True).start()
+
+    def _refresh_worker(self):
+        while True:
+            with self.lock:
+                snapshot, self.queued = self.queued, None
+                if snapshot is None:
+                    self.running = False
+                    return
+            try:
+                self.refresh(snapshot)
+            except Exception as e:
+                print(f"Error refreshing equivalents: {e}")
+
+    def lookup(self, brand: str, sku: str) -> dict[str, list[tuple[str, float]]]:
+        """Return {other brand: [(sku, delta E), ...]} for one skein from the cache.
+
+        Never waits for a rebuild; stale pairs are refreshed in the background for the next lookup.
+        """
+        self.refresh_async()
+        pairs = self.pairs
+        result = {}
+        for other in sorted(self.catalog.skeins):
+            if other == brand:
+                continue
+            matches = pairs.get(self.pair_key(brand, other), {}).get(sku)
+            if matches:
+                result[other] = [(match, distance) for match, distance in matches]
+        return result
+
+if __name__ == "__main__":
+    # Batch job: rebuild the cache and print a conversion chart as CSV
+    import sys
+    from skein import Catalog
+
+    catalogs_dir = sys.argv[1] if len(sys.argv) > 1 else "catalogs"
+    catalog = Catalog()
+    for filename in os.listdir(catalogs_dir):
+        if filename.endswith(".json") and not filename.startswith("_"):
+            with open(os.path.join(catalogs_dir, filename)) as f:
+                catalog.load_brand(os.path.splitext(filename)[0], json.load(f))
+
+    table = EquivalentsTable(catalog, catalogs_dir)
+    print(f"Rebuilt {table.refresh()} brand pairs", file=sys.stderr)
+    print("brand,sku,other_brand,other_sku,delta_e")
+    for key, skus in sorted(table.pairs.items()):
+        brand, other = key.split('>', 1)
+        for sku, matches in skus.items():
+            for match, distance in matches:
+                print(f"{brand},{sku},{other},{match},{distance}")
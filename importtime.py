@@ -0,0 +1,103 @@
+"""Launch import budget for the source run and the PyInstaller builds from spec/*.spec.
+
+    python importtime.py                    check `python main.py` under -X importtime
+    python importtime.py --frozen           check the build in dist/ for this platform
+    python importtime.py --frozen PATH      check a build somewhere else
+
+Exits with status 1 when launch imports take longer than the budget, or load a module that
+should only be imported on first use.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BUDGET_MS = 400
+# Only needed by dialogs, the update check or the About box, launch must not import these
+LAZY_MODULES = ("about", "requests", "webbrowser", "wx.adv", "wx.grid",
+                "updater.gui", "updater.update", "ui.debug", "ui.pattern", "ui.planner", "ui.profile", "ui.usage")
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def parse_importtime(output: str) -> list[tuple[str, int, int, int]]:
+    """(module, self us, cumulative us, depth) for each line of -X importtime output."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        # Skips the column header
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(parts[0]), int(parts[1]), depth))
+    return rows
+
+
+def frozen_path() -> str:
+    if sys.platform == "darwin":
+        return os.path.join(ROOT, "dist", "Skeincare.app", "Contents", "MacOS", "Skeincare")
+    if sys.platform == "win32":
+        return os.path.join(ROOT, "dist", "Skeincare.exe")
+    return os.path.join(ROOT, "dist", "Skeincare")
+
+
+def run(command: list[str]) -> tuple[dict, str]:
+    """Launch with --import-check and return its report and stderr."""
+    with tempfile.TemporaryDirectory() as directory:
+        report_path = os.path.join(directory, "imports.json")
+        result = subprocess.run(command + ["--import-check", report_path], cwd=ROOT,
+                                capture_output=True, text=True, timeout=120)
+        if not os.path.exists(report_path):
+            raise RuntimeError(f"No import report, exit code {result.returncode}:\n{result.stderr}")
+        with open(report_path) as f:
+            return json.load(f), result.stderr
+
+
+def check(report: dict, elapsed_ms: float, budget_ms: float) -> list[str]:
+    failures = []
+    if elapsed_ms > budget_ms:
+        failures.append(f"launch imports took {elapsed_ms:.0f} ms, budget is {budget_ms:.0f} ms")
+    loaded = set(report["modules"])
+    failures.extend(f"{module} was imported at launch" for module in LAZY_MODULES if module in loaded)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check launch imports against a time budget")
+    parser.add_argument("--budget", type=float, default=BUDGET_MS, help="milliseconds allowed for launch imports")
+    parser.add_argument("--frozen", nargs="?", const="", help="check a PyInstaller build instead of the source run")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    args = parser.parse_args()
+
+    if args.frozen is not None:
+        path = args.frozen or frozen_path()
+        print(f"Checking {path}")
+        report, _ = run([path])
+        # Frozen builds cannot run under -X importtime, so they are timed by the wall clock
+        elapsed_ms = report["seconds"] * 1000
+    else:
+        print("Checking python main.py")
+        report, stderr = run([sys.executable, "-X", "importtime", os.path.join(ROOT, "main.py")])
+        rows = parse_importtime(stderr)
+        # Top level cumulative times, the import cost alone without the wall clock noise
+        elapsed_ms = sum(row[2] for row in rows if row[3] == 0) / 1000
+        print(f"{'Module':<40}{'self ms':>10}{'total ms':>10}")
+        for name, own, total, depth in sorted((row for row in rows if row[3] == 0), key=lambda row: -row[2])[:args.top]:
+            print(f"{name:<40}{own / 1000:>10.1f}{total / 1000:>10.1f}")
+
+    print(f"Launch imports: {elapsed_ms:.0f} ms, {len(report['modules'])} modules")
+    failures = check(report, elapsed_ms, args.budget)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+import hmac
+import json
+import os
+import queue
+import secrets
+import socket
+import threading
+import time
+
+LOCK_FILE = "instance.lock"
+HOST = "127.0.0.1"
+# How long a connection waits for the UI thread before answering with an error
+RESPONSE_TIMEOUT = 10.0
+# Attempts to reach the lock holder before its lock file counts as stale
+STALE_RETRIES = 3
+STALE_RETRY_DELAY = 0.2
+
+
+class InstanceError(Exception):
+    pass
+
+
+class Job:
+    __slots__ = ('request', 'done', 'ok', 'result')
+
+    def __init__(self, request):
+        self.request = request
+        self.done = threading.Event()
+        self.ok = False
+        self.result = None
+
+    def finish(self, ok: bool, result):
+        self.ok = ok
+        self.result = result
+        self.done.set()
+
+    def response(self) -> dict:
+        if not self.done.is_set():
+            return {"ok": False, "error": "timed out waiting for the application"}
+        if self.ok:
+            return {"ok": True, "result": self.result}
+        return {"ok": False, "error": self.result}
+
+
+class InstanceServer:
+    """Local socket owned by the first running instance.
+
+    The port and a random token are written to the lock file, readable only by the current
+    user. The protocol is one JSON object per line each way; every request carries the token
+    and an "op", the response is {"ok": true, "result": ...} or {"ok": false, "error": ...}.
+    Connections are read on worker threads, requests are applied on the UI thread in batches
+    and answered in order, so a client may pipeline many requests without waiting.
+    """
+
+    def __init__(self, lock_path: str = LOCK_FILE):
+        self.lock_path = lock_path
+        self.token = secrets.token_hex(16)
+        self.sock: socket.socket | None = None
+        self.handler = None
+        self.dispatch = None
+        self.finish = None
+        self.lock = threading.Lock()
+        self.pending: list[Job] = []
+        self.scheduled = False
+        self.closed = False
+
+    def bind(self) -> bool:
+        """Take the lock file and listen, or return False if another live instance holds it."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind((HOST, 0))
+        sock.listen(16)
+        content = json.dumps({"port": sock.getsockname()[1], "pid": os.getpid(), "token": self.token}).encode()
+
+        # Written in full to a private file first and linked into place, so the lock file
+        # appears complete or not at all
+        temporary = f"{self.lock_path}.{os.getpid()}.tmp"
+        fd = os.open(temporary, os.O_CREAT | os.O_TRUNC | os.O_WRONLY, 0o600)
+        try:
+            os.write(fd, content)
+        finally:
+            os.close(fd)
+
+        try:
+            for _ in range(2):
+                try:
+                    self._place_lock(temporary, content)
+                except FileExistsError:
+                    if self._holder_alive():
+                        break
+                    # Left behind by an instance that did not exit cleanly
+                    try:
+                        os.remove(self.lock_path)
+                    except OSError as e:
+                        print(f"Error removing stale lock file: {e}")
+                    continue
+
+                self.sock = sock
+                # Requests are accepted and queued while the application is still loading
+                threading.Thread(target=self._accept, name="instance-accept", daemon=True).start()
+                return True
+        finally:
+            try:
+                os.remove(temporary)
+            except OSError as e:
+                print(f"Error removing temporary lock file: {e}")
+
+        sock.close()
+        return False
+
+    def _place_lock(self, temporary: str, content: bytes):
+        """Create the lock file, raising FileExistsError if another instance has it."""
+        try:
+            os.link(temporary, self.lock_path)
+        except FileExistsError:
+            raise
+        except OSError:
+            # Filesystems without hard links, _holder_alive retries if it reads this half written
+            fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+            try:
+                os.write(fd, content)
+            finally:
+                os.close(fd)
+
+    def _holder_alive(self) -> bool:
+        # An unreadable or silent lock gets a few tries before it is treated as stale
+        for attempt in range(STALE_RETRIES):
+            if attempt:
+                time.sleep(STALE_RETRY_DELAY)
+            client = InstanceClient.connect(self.lock_path)
+            if client is not None:
+                client.close()
+                return True
+        return False
+
+    def start(self, handler, dispatch, finish=None):
+        """Begin applying requests; handler(request) runs through dispatch on the UI thread, finish() after each batch."""
+        with self.lock:
+            self.handler = handler
+            self.dispatch = dispatch
+            self.finish = finish
+            self.scheduled = bool(self.pending)
+        if self.scheduled:
+            dispatch(self._drain)
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+        if self.sock:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+        try:
+            with open(self.lock_path) as f:
+                owner = json.load(f).get("pid")
+            if owner == os.getpid():
+                os.remove(self.lock_path)
+        except (OSError, ValueError) as e:
+            print(f"Error removing lock file: {e}")
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), name="instance-conn", daemon=True).start()
+
+    def _serve(self, conn: socket.socket):
+        jobs: queue.Queue = queue.Queue()
+        writer = threading.Thread(target=self._respond, args=(conn, jobs), name="instance-reply", daemon=True)
+        writer.start()
+        try:
+            with conn.makefile('rb') as reader:
+                for line in reader:
+                    if not line.strip():
+                        continue
+                    job = self._parse(line)
+                    jobs.put(job)
+                    if not job.done.is_set():
+                        self._submit(job)
+        except OSError:
+            pass
+        finally:
+            jobs.put(None)
+
+    def _parse(self, line: bytes) -> Job:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            job = Job(None)
+            job.finish(False, "invalid JSON")
+            return job
+        job = Job(request)
+        if not isinstance(request, dict):
+            job.finish(False, "request must be an object")
+        elif not hmac.compare_digest(str(request.get("token", "")), self.token):
+            job.finish(False, "bad token")
+        elif request.get("op") == "ping":
+            # Answered here so later launches can tell a busy instance from a dead one
+            job.finish(True, "pong")
+        return job
+
+    def _respond(self, conn: socket.socket, jobs: queue.Queue):
+        try:
+            while (job := jobs.get()) is not None:
+                job.done.wait(RESPONSE_TIMEOUT)
+                response = job.response()
+                if isinstance(job.request, dict) and "id" in job.request:
+                    response["id"] = job.request["id"]
+                conn.sendall(json.dumps(response).encode() + b"\n")
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+    def _submit(self, job: Job):
+        with self.lock:
+            if self.closed:
+                job.finish(False, "application is closing")
+                return
+            self.pending.append(job)
+            if self.scheduled or self.dispatch is None:
+                return
+            self.scheduled = True
+        self.dispatch(self._drain)
+
+    def _drain(self):
+        # Everything queued since the last drain is applied in one go on the UI thread
+        with self.lock:
+            jobs, self.pending = self.pending, []
+            self.scheduled = False
+        for job in jobs:
+            try:
+                job.finish(True, self.handler(job.request))
+            except Exception as e:
+                job.finish(False, str(e) or type(e).__name__)
+        if self.finish and jobs:
+            try:
+                self.finish()
+            except Exception as e:
+                print(f"Error finishing instance commands: {e}")
+
+
+class InstanceClient:
+    """Connection to a running instance, for later launches and scripts."""
+
+    def __init__(self, port: int, token: str, timeout: float = RESPONSE_TIMEOUT):
+        self.token = token
+        self.sock = socket.create_connection((HOST, port), timeout=timeout)
+        self.reader = self.sock.makefile('rb')
+
+    @classmethod
+    def connect(cls, lock_path: str = LOCK_FILE):
+        """Client for the instance named in the lock file, or None if it is not answering."""
+        try:
+            with open(lock_path) as f:
+                lock = json.load(f)
+            client = cls(lock["port"], lock["token"], timeout=2.0)
+            client.request("ping")
+        except (OSError, ValueError, KeyError, InstanceError):
+            return None
+        client.sock.settimeout(RESPONSE_TIMEOUT)
+        return client
+
+    def send(self, op: str, **fields):
+        self.sock.sendall(json.dumps({"token": self.token, "op": op, **fields}).encode() + b"\n")
+
+    def receive(self):
+        line = self.reader.readline()
+        if not line:
+            raise InstanceError("connection closed")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise InstanceError(response.get("error", "request failed"))
+        return response.get("result")
+
+    def request(self, op: str, **fields):
+        self.send(op, **fields)
+        return self.receive()
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+
+def parse_skein_amount(value: str) -> tuple[str, str, int]:
+    """BRAND:SKU:AMOUNT from the command line."""
+    import argparse
+    try:
+        brand, sku, amount = value.rsplit(":", 2)
+        return brand.lower(), sku, int(amount)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected BRAND:SKU:NUMBER, got '{value}'")
+
+
+def parse_command(argv: list[str]) -> list[dict]:
+    """Requests for the running instance from launch arguments; a plain launch just focuses it."""
+    if not argv:
+        return [{"op": "focus"}]
+    import argparse
+    parser = argparse.ArgumentParser(prog="skeincare")
+    parser.add_argument("--search", help="search for a SKU or name")
+    parser.add_argument("--adjust", action="append", default=[], type=parse_skein_amount, metavar="BRAND:SKU:DELTA",
+                        help="change a skein count, e.g. DMC:310:-1")
+    parser.add_argument("--set", action="append", default=[], type=parse_skein_amount, metavar="BRAND:SKU:COUNT",
+                        help="set a skein count")
+    # Unknown arguments are ignored, platforms and bundlers add their own
+    args, _ = parser.parse_known_args(argv)
+
+    requests = [{"op": "focus"}]
+    if args.search is not None:
+        requests.append({"op": "search", "text": args.search})
+    requests.extend({"op": "adjust", "brand": brand, "sku": sku, "delta": delta} for brand, sku, delta in args.adjust)
+    requests.extend({"op": "set", "brand": brand, "sku": sku, "count": count} for brand, sku, count in args.set)
+    return requests
+
+
+def forward(requests: list[dict], lock_path: str = LOCK_FILE) -> bool:
+    """Send launch requests to the running instance, False if there is none."""
+    client = InstanceClient.connect(lock_path)
+    if client is None:
+        return False
+    try:
+        for result in client.request("batch", requests=requests):
+            if result is not None:
+                print(result)
+    except InstanceError as e:
+        print(f"Error from running instance: {e}")
+    finally:
+        client.close()
+    return True
@@ -1,15 +1,40 @@
+import time
+launch_started = time.perf_counter()
+
 import sys
 import os
 import json
 import wx
 
+import instance
 from skein import Catalog
 from ui import Window
 from model import SkeinModel
-
+from profiles import ProfileSet
+
+# Report what launch imported and how long it took, read by importtime.py for source and frozen builds
+if "--import-check" in sys.argv:
+    report = json.dumps({"seconds": time.perf_counter() - launch_started, "modules": sorted(sys.modules)})
+    index = sys.argv.index("--import-check") + 1
+    if index < len(sys.argv):
+        with open(sys.argv[index], 'w') as f:
+            f.write(report)
+    else:
+        print(report)
+    sys.exit(0)
+
+
+# A second launch hands its arguments to the running instance instead of loading everything again
+launch_requests = instance.parse_command(sys.argv[1:])
+server = instance.InstanceServer()
+if not server.bind():
+    if instance.forward(launch_requests):
+        print("Skein Care is already running, request forwarded.")
+        sys.exit(0)
+    print("Running instance did not answer, continuing without the instance server.")
+    server = None
 
 app = wx.App()
-library: dict[str, dict[str, int]] = {}
 catalog: Catalog = Catalog()
 
 print("Loading catalogs...")
@@ -28,19 +53,9 @@ for filename in os.listdir(catalogs_dir):
         except Exception as e:
             print(f"Error loading catalog {filename}: {e}")
 
-print("Loading library...")
-library_file = "library.json"
-if os.path.exists(library_file):
-    try:
-        with open(library_file, 'r') as f1:
-            library = json.load(f1)
-    except Exception as e:
-        print(f"Error loading library: {e}")
-else:
-    print("Library file not found, creating new library.")
-    library = {}
-    with open(library_file, 'w') as f2:
-        json.dump(library, f2, indent=4)
+print("Loading profiles...")
+profiles = ProfileSet(catalog)
+profiles.load()
 
 print("Loading defaults...")
 defaults = {}
@@ -57,16 +72,26 @@ else:
         json.dump(defaults or {}, f, indent=4)
 
 print("Creating model...")
-model = SkeinModel(library, catalog)
+model = SkeinModel(profiles, catalog)
+model.equivalents.refresh_async()
 
 print("Creating main window...")
 window = Window(model, defaults)
 window.Show()
 app.SetTopWindow(window)
-window.update_at_launch()
+if server:
+    server.start(window.handle_command, wx.CallAfter, window.finish_commands)
+# Launch arguments apply here too, the focus request is pointless for ourselves
+if len(launch_requests) > 1:
+    window.handle_command({"op": "batch", "requests": launch_requests[1:]})
+    window.finish_commands()
+# The update check imports requests and goes to the network, so it waits until the window is up
+wx.CallAfter(window.update_at_launch)
 print("Starting main loop...")
 exit_code = app.MainLoop()
 print("...Main loop ended.")
+if server:
+    server.close()
 print("Saving defaults...")
 
 try:
@@ -79,12 +104,13 @@ except Exception as e:
 
 
 try:
-    print("Saving library...")
-    with open(library_file, 'w') as f:
-        json.dump(library, f, indent=4)
-    print("Library saved.")
+    print("Saving profiles...")
+    profiles.save()
+    print("Profiles saved.")
 except Exception as e:
-    print(f"Error saving library: {e}")
+    print(f"Error saving profiles: {e}")
+
+model.usage.close()
 
 print("Exiting...")
 sys.exit(exit_code)
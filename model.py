@@ -2,6 +2,13 @@ import json
 import os
 from pathlib import Path
 from skein import Skein, Catalog
+from equivalents import EquivalentsTable
+from nearest import ColorIndex
+from color import rgb_to_lab
+from usage import UsageHistory
+from undo import UndoStack, CountChange, TransferChange
+from profiles import ProfileSet
+from planner import GradientPlanner
 
 
 def csv_to_json(csv_path: Path):
@@ -25,15 +32,96 @@ def csv_to_json(csv_path: Path):
 
 
 class SkeinModel:
-    def __init__(self, library, catalog):
-        self.library = library
+    def __init__(self, profiles: ProfileSet, catalog):
+        self.profiles = profiles
         self.catalog = catalog
         self.sort_method = 0  # Default sort by brand
+        self.equivalents = EquivalentsTable(catalog)
+        self._color_index: ColorIndex | None = None
+        self._planner: GradientPlanner | None = None
+        self.usage = UsageHistory()
+        self.undo = UndoStack()
 
-    def update_skein_count(self, brand, sku, count):
-        if brand not in self.library:
-            self.library[brand] = {}
-        self.library[brand][sku] = count
+    def get_count(self, brand, sku, profile=None):
+        """Count in the active profile, or in the named one"""
+        return self.profiles.get_count(brand, sku, profile)
+
+    def update_skein_count(self, brand, sku, count, record=True, profile=None, reversal=False):
+        profile = self.profiles.active if profile is None else profile
+        old = self.profiles.set_count(brand, sku, count, profile)
+        if old != count:
+            self.usage.record(brand, sku, old, count, reversal=reversal, profile=profile)
+            if record:
+                self.undo.record_count(brand, sku, old, count, profile)
+
+    def transfer_skeins(self, brand, sku, amount, source, target, record=True):
+        """Move skeins from one profile to another as one step"""
+        self.profiles.transfer(brand, sku, amount, source, target)
+        if record:
+            self.undo.record_transfer(brand, sku, amount, source, target)
+
+    def switch_profile(self, name):
+        self.profiles.switch(name)
+
+    def create_profile(self, name):
+        self.profiles.create(name)
+
+    def rename_profile(self, old, new):
+        self.profiles.rename(old, new)
+        self.usage.rename_profile(old, new)
+        # Recorded changes name their profile, so they would no longer apply
+        self.undo.clear()
+
+    def remove_profile(self, name):
+        self.profiles.remove(name)
+        self.undo.clear()
+
+    def nearest_skeins(self, color, k=3) -> list[tuple[float, Skein]]:
+        """Closest catalog skeins to an RGB colour as (delta E, skein) pairs"""
+        if self._color_index is None:
+            self._color_index = ColorIndex(((brand, sku), skein.lab)
+                                           for brand, brand_skeins in self.catalog.skeins.items()
+                                           for sku, skein in brand_skeins.items())
+        return [(distance, self.catalog.skeins[brand][sku])
+                for distance, (brand, sku) in self._color_index.nearest(rgb_to_lab([color])[0], k)]
+
+    def gradient_planner(self) -> GradientPlanner:
+        """Neighbour graph over the catalog, built on first use and then kept up to date"""
+        if self._planner is None:
+            self._planner = GradientPlanner(self.catalog)
+        return self._planner
+
+    def plan_gradient(self, start, end, owned_only=False, steps=None) -> list[tuple[float, Skein]]:
+        """Skeins from start to end in even steps as (delta E from the previous skein, skein) pairs"""
+        owned = None
+        if owned_only:
+            owned = {(brand, sku) for brand, brand_skeins in self.catalog.skeins.items()
+                     for sku in brand_skeins if self.get_count(brand, sku) > 0}
+        return [(distance, self.catalog.skeins[brand][sku])
+                for distance, (brand, sku) in self.gradient_planner().plan(start, end, owned, steps)]
+
+    def save_skein(self, skein, record=True):
+        """Write a skein to its brand file and add it to the catalog, replacing any existing entry"""
+        brand_file = os.path.join("catalogs", f"{skein.brand}.json")
+        brand_data = {}
+
+        # Load existing brand data if file exists
+        if os.path.exists(brand_file):
+            with open(brand_file, 'r') as f:
+                brand_data = json.load(f)
+
+        brand_data[skein.sku] = {
+            "name": skein.name,
+            "color": skein.color
+        }
+
+        with open(brand_file, 'w') as f:
+            json.dump(brand_data, f, indent=4)
+
+        if record:
+            existing = self.catalog.skeins.get(skein.brand, {}).get(skein.sku)
+            self.undo.record_skein(existing.to_dict() if existing else None, skein.to_dict())
+        self.add_skein_to_catalog(skein)
 
     def add_skein_to_catalog(self, skein):
         brand = skein.brand
@@ -42,25 +130,29 @@ class SkeinModel:
         if brand not in self.catalog.skeins:
             self.catalog.skeins[brand] = {}
 
+        skein.update_color_keys()
         self.catalog.skeins[brand][sku] = skein
+        self.catalog.position(brand, sku)
+        self._color_index = None
+        if self._planner is not None:
+            self._planner.update(brand, sku, skein.lab)
         
-    def delete_skein(self, brand, sku):
-        """Delete a skein from both catalog and library"""
+    def delete_skein(self, brand, sku, record=True):
+        """Delete a skein from the catalog and every profile"""
         # Remove from catalog if exists
         if brand in self.catalog.skeins and sku in self.catalog.skeins[brand]:
+            snapshot = self.catalog.skeins[brand][sku].to_dict()
+            counts = self.profiles.remove_skein(brand, sku)
+            if record:
+                self.undo.record_skein(snapshot, None, counts)
             del self.catalog.skeins[brand][sku]
+            self._color_index = None
+            if self._planner is not None:
+                self._planner.remove(brand, sku)
             
             # If brand has no more skeins, remove the brand entry
             if not self.catalog.skeins[brand]:
                 del self.catalog.skeins[brand]
-                
-            # Also remove from library if exists
-            if brand in self.library and sku in self.library[brand]:
-                del self.library[brand][sku]
-                
-                # If brand has no more skeins in library, remove the brand entry
-                if not self.library[brand]:
-                    del self.library[brand]
                     
             # Delete the skein from the brand file
             brand_file = f"catalogs/{brand}.json"
@@ -79,3 +171,46 @@ class SkeinModel:
                     
             return True
         return False
+
+    def undo_last(self):
+        """Revert the most recent change and return it, so the UI can refresh just that skein"""
+        entry = self.undo.pop_undo()
+        if entry:
+            try:
+                self._apply_change(entry, reverse=True)
+            except ValueError:
+                # A transfer whose skeins have since been used cannot be reversed, keep it on the stack
+                self.undo.pop_redo()
+                raise
+        return entry
+
+    def redo_last(self):
+        entry = self.undo.pop_redo()
+        if entry:
+            try:
+                self._apply_change(entry, reverse=False)
+            except ValueError:
+                self.undo.pop_undo()
+                raise
+        return entry
+
+    def _apply_change(self, entry, reverse):
+        if isinstance(entry, CountChange):
+            # An undo is logged as a reversal so the usage it takes back is not counted as used
+            self.update_skein_count(entry.brand, entry.sku, entry.old if reverse else entry.new,
+                                    record=False, profile=entry.profile, reversal=reverse)
+            return
+        if isinstance(entry, TransferChange):
+            source, target = (entry.target, entry.source) if reverse else (entry.source, entry.target)
+            self.transfer_skeins(entry.brand, entry.sku, entry.amount, source, target, record=False)
+            return
+
+        target, source = (entry.before, entry.after) if reverse else (entry.after, entry.before)
+        if target is None:
+            self.delete_skein(source['brand'], source['sku'], record=False)
+            return
+
+        self.save_skein(Skein.from_dict(target), record=False)
+        if source is None and entry.counts:
+            # Undoing a delete brings the profile counts back too
+            self.profiles.restore_skein(target['brand'], target['sku'], entry.counts)
@@ -0,0 +1,60 @@
+import heapq
+import math
+
+
+class ColorIndex:
+    """A k-d tree over CIELAB points, so nearest-colour lookups avoid scanning every skein."""
+
+    def __init__(self, items):
+        # items: iterable of (key, (L, a, b))
+        self.keys = []
+        self.points = []
+        for key, lab in items:
+            self.keys.append(key)
+            self.points.append(tuple(lab))
+        self.root = self._build(list(range(len(self.points))), 0)
+
+    def __len__(self):
+        return len(self.points)
+
+    def _build(self, indices: list[int], depth: int):
+        if not indices:
+            return None
+        axis = depth % 3
+        indices.sort(key=lambda i: self.points[i][axis])
+        mid = len(indices) // 2
+        return (indices[mid], axis,
+                self._build(indices[:mid], depth + 1),
+                self._build(indices[mid + 1:], depth + 1))
+
+    def nearest(self, lab, k: int = 1, exclude=None) -> list[tuple[float, object]]:
+        """Return up to k (delta E76, key) pairs, closest first."""
+        if k <= 0 or self.root is None:
+            return []
+
+        points = self.points
+        keys = self.keys
+        # Max-heap of (-squared distance, index) holding the best k so far
+        best: list[tuple[float, int]] = []
+        # Each entry carries a lower bound on the squared distance to anything in its subtree
+        stack = [(self.root, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if node is None or (len(best) == k and bound >= -best[0][0]):
+                continue
+            index, axis, left, right = node
+            point = points[index]
+
+            if exclude is None or keys[index] != exclude:
+                distance = (point[0] - lab[0]) ** 2 + (point[1] - lab[1]) ** 2 + (point[2] - lab[2]) ** 2
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, index))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, index))
+
+            offset = lab[axis] - point[axis]
+            near, far = (left, right) if offset < 0 else (right, left)
+            stack.append((far, max(bound, offset * offset)))
+            stack.append((near, bound))
+
+        return [(math.sqrt(-distance), keys[index]) for distance, index in sorted(best, reverse=True)]
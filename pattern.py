@@ -0,0 +1,115 @@
+import csv
+import io
+from pathlib import Path
+
+
+class Pattern:
+    def __init__(self, name: str):
+        self.name = name
+        self.requirements: dict[tuple[str, str], int] = {}
+        # Lines that were not a floss entry, besides a header row
+        self.skipped = 0
+
+    def add(self, brand: str, sku: str, count: int):
+        key = (brand.lower(), sku)
+        self.requirements[key] = self.requirements.get(key, 0) + count
+
+
+class ShortageRow:
+    def __init__(self, brand: str, sku: str, name: str, in_catalog: bool):
+        self.brand = brand
+        self.sku = sku
+        self.name = name
+        self.in_catalog = in_catalog
+        self.needed = 0
+        self.owned = 0
+        self.short = 0
+        # Pattern name -> (reserved from stock, still short) in queue order
+        self.allocations: dict[str, tuple[int, int]] = {}
+
+
+def looks_like_sku(field: str) -> bool:
+    # Codes such as 403 or B5200 carry a digit and no spaces, colour names like Black do not
+    return len(field) <= 8 and any(char.isdigit() for char in field) and not any(char.isspace() for char in field)
+
+
+def parse_pattern(name: str, text: str, default_brand: str = 'dmc', brands=None) -> Pattern:
+    """Parse a floss list of `sku,count`, `brand,sku,count`, `sku,name,count` or `brand,sku,name,count` lines.
+
+    Fields are comma, tab or space separated and the count is always last. A line starts with
+    a brand when its first field is one of `brands`, the catalog brand names, or its second
+    field looks like a SKU; otherwise it starts with the SKU in the default brand.
+    """
+    brands = {brand.lower() for brand in brands} if brands is not None else set()
+    pattern = Pattern(name)
+    first = True
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        dialect = 'excel-tab' if '\t' in line else 'excel'
+        fields = next(csv.reader(io.StringIO(line), dialect))
+        if len(fields) == 1:
+            fields = line.split()
+        fields = [field.strip() for field in fields if field.strip()]
+
+        header, first = first, False
+        count = fields[-1] if len(fields) >= 2 else ''
+        if not count.isdecimal():
+            # A header row is expected, anything else is reported
+            if not header:
+                pattern.skipped += 1
+            continue
+
+        if len(fields) == 2:
+            brand, sku = default_brand, fields[0]
+        elif fields[0].lower() in brands or looks_like_sku(fields[1]):
+            brand, sku = fields[0], fields[1]
+        else:
+            # 310,Black,2 names the colour rather than the brand
+            brand, sku = default_brand, fields[0]
+        pattern.add(brand, sku, int(count))
+    return pattern
+
+
+def load_pattern(path: Path, default_brand: str = 'dmc', brands=None, name: str | None = None) -> Pattern:
+    with open(path, newline='') as f:
+        return parse_pattern(name or Path(path).stem, f.read(), default_brand, brands)
+
+
+def shortage_report(model, patterns: list[Pattern]) -> list[ShortageRow]:
+    """Sum the requirements of the queued patterns and reserve stock from the library in queue order."""
+    rows: dict[tuple[str, str], ShortageRow] = {}
+    remaining: dict[tuple[str, str], int] = {}
+
+    for pattern in patterns:
+        for key, needed in pattern.requirements.items():
+            row = rows.get(key)
+            if row is None:
+                brand, sku = key
+                skein = model.catalog.skeins.get(brand, {}).get(sku)
+                row = ShortageRow(brand, sku, skein.name if skein else '', skein is not None)
+                row.owned = model.get_count(brand, sku)
+                remaining[key] = row.owned
+                rows[key] = row
+
+            reserved = min(needed, remaining[key])
+            remaining[key] -= reserved
+            previous_reserved, previous_short = row.allocations.get(pattern.name, (0, 0))
+            row.allocations[pattern.name] = (previous_reserved + reserved, previous_short + needed - reserved)
+            row.needed += needed
+
+    for row in rows.values():
+        row.short = max(0, row.needed - row.owned)
+
+    return sorted(rows.values(), key=lambda row: (row.brand, int(row.sku) if row.sku.isdecimal() else -1, row.sku))
+
+
+def write_shopping_list(path: Path, rows: list[ShortageRow]):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['brand', 'sku', 'name', 'buy', 'needed', 'owned'])
+        for row in rows:
+            if row.short > 0:
+                writer.writerow([row.brand, row.sku, row.name, row.short, row.needed, row.owned])
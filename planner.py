@@ -0,0 +1,209 @@
+import math
+
+from nearest import ColorIndex
+
+
+def delta_e(lab1, lab2) -> float:
+    return math.sqrt((lab1[0] - lab2[0]) ** 2 + (lab1[1] - lab2[1]) ** 2 + (lab1[2] - lab2[2]) ** 2)
+
+
+class NeighbourGraph:
+    """k-nearest-neighbour graph over skeins in CIELAB, kept up to date as skeins change.
+
+    Every node links to its k closest skeins, and links are symmetric. Lookups use a k-d tree
+    built once; skeins added since are scanned directly and removed ones skipped until enough
+    have changed to make a rebuild worthwhile.
+    """
+
+    REBUILD_AFTER = 64
+
+    def __init__(self, items, k: int = 8):
+        # items: iterable of (key, (L, a, b))
+        self.k = k
+        self.labs: dict = {}
+        # Each node's own k nearest, and the symmetric union used for searching
+        self.nearest: dict[object, dict[object, float]] = {}
+        self.edges: dict[object, dict[object, float]] = {}
+        for key, lab in items:
+            self.labs[key] = tuple(lab)
+        self._rebuild_index()
+        for key in self.labs:
+            self.edges[key] = {}
+        for key, lab in self.labs.items():
+            self._link(key, self._knn(lab, self.k, exclude=key))
+
+    def __len__(self):
+        return len(self.labs)
+
+    def _rebuild_index(self):
+        self.index = ColorIndex(self.labs.items())
+        self.pending: set = set()
+        self.stale: set = set()
+
+    def _knn(self, lab, k: int, exclude=None) -> list[tuple[float, object]]:
+        # Skipped keys can crowd out real ones, so ask the tree for that many more
+        found = [(distance, key) for distance, key in self.index.nearest(lab, k + len(self.stale), exclude)
+                 if key not in self.stale]
+        found.extend((delta_e(lab, self.labs[key]), key) for key in self.pending if key != exclude)
+        found.sort(key=lambda pair: pair[0])
+        return found[:k]
+
+    def _link(self, key, neighbours: list[tuple[float, object]]):
+        self.nearest[key] = {other: distance for distance, other in neighbours}
+        for other, distance in self.nearest[key].items():
+            self.edges[key][other] = distance
+            self.edges[other][key] = distance
+
+    def _unlink(self, key, other):
+        # An edge stays while either end still counts the other among its nearest
+        if other in self.nearest.get(key, {}) or key in self.nearest.get(other, {}):
+            return
+        self.edges[key].pop(other, None)
+        self.edges[other].pop(key, None)
+
+    def add(self, key, lab):
+        if key in self.labs:
+            self.remove(key)
+        lab = tuple(lab)
+        neighbours = self._knn(lab, 2 * self.k)
+        self.labs[key] = lab
+        self.pending.add(key)
+        self.edges[key] = {}
+        self._link(key, neighbours[:self.k])
+
+        # Nodes close by take the new skein in place of their farthest neighbour
+        for distance, other in neighbours:
+            others = self.nearest[other]
+            if len(others) < self.k:
+                others[key] = distance
+            else:
+                farthest = max(others, key=others.get)
+                if distance >= others[farthest]:
+                    continue
+                del others[farthest]
+                others[key] = distance
+                self._unlink(other, farthest)
+            self.edges[other][key] = distance
+            self.edges[key][other] = distance
+        self._maybe_rebuild()
+
+    def remove(self, key):
+        if key not in self.labs:
+            return
+        del self.labs[key]
+        del self.nearest[key]
+        if key in self.pending:
+            self.pending.discard(key)
+        else:
+            self.stale.add(key)
+
+        # Former neighbours find a replacement so the graph does not thin out around the gap
+        for other in self.edges.pop(key):
+            self.edges[other].pop(key, None)
+            others = self.nearest[other]
+            if others.pop(key, None) is not None:
+                for distance, candidate in self._knn(self.labs[other], self.k, exclude=other):
+                    if candidate not in others:
+                        others[candidate] = distance
+                        self.edges[other][candidate] = distance
+                        self.edges[candidate][other] = distance
+                        break
+        self._maybe_rebuild()
+
+    def _maybe_rebuild(self):
+        if len(self.pending) + len(self.stale) > self.REBUILD_AFTER:
+            self._rebuild_index()
+
+    def path(self, start, end, steps: int) -> list:
+        """Keys from start to end in at most `steps` steps, each as close as possible to an even share.
+
+        The cost is the sum of (delta E - target)^2 with target = end-to-end delta E / steps,
+        so near-duplicate skeins cost as much as a jump that is too large. Layer h holds the
+        cheapest way to reach each node in h steps. A direct jump to the end is always
+        allowed, so a path exists even between separate clusters of the graph.
+        """
+        labs = self.labs
+        end_lab = labs[end]
+        target = delta_e(labs[start], end_lab) / steps
+        layer = {start: 0.0}
+        previous: dict[tuple[object, int], object] = {}
+        best_cost, best_steps = math.inf, 0
+        for step in range(1, steps + 1):
+            following: dict = {}
+            for node, cost in layer.items():
+                moves = list(self.edges[node].items())
+                moves.append((end, delta_e(labs[node], end_lab)))
+                for other, distance in moves:
+                    new_cost = cost + (distance - target) ** 2
+                    if new_cost < following.get(other, math.inf):
+                        following[other] = new_cost
+                        previous[(other, step)] = node
+            if following.get(end, math.inf) < best_cost:
+                best_cost, best_steps = following[end], step
+            # Routes stop at the end, they never pass through it
+            following.pop(end, None)
+            layer = following
+
+        route = [end]
+        for step in range(best_steps, 0, -1):
+            route.append(previous[(route[-1], step)])
+        route.reverse()
+
+        # Layers may revisit a skein; the loop in between is cut out
+        simple = []
+        for key in route:
+            if key in simple:
+                del simple[simple.index(key) + 1:]
+            else:
+                simple.append(key)
+        return simple
+
+class GradientPlanner:
+    """Perceptually even runs of skeins between two colours.
+
+    The graph over the whole catalog is built once and updated as skeins are added, edited
+    or deleted. Owned-only plans use a small graph over the owned skeins, built per query.
+    """
+
+    # Step size used to pick a step count when none is asked for
+    STEP_DELTA_E = 8.0
+
+    def __init__(self, catalog, k: int = 8):
+        self.catalog = catalog
+        self.k = k
+        self.graph = NeighbourGraph(self.catalog_items(), k)
+
+    def catalog_items(self):
+        for brand, brand_skeins in self.catalog.skeins.items():
+            for sku, skein in brand_skeins.items():
+                yield (brand, sku), skein.lab
+
+    def update(self, brand: str, sku: str, lab):
+        self.graph.add((brand, sku), lab)
+
+    def remove(self, brand: str, sku: str):
+        self.graph.remove((brand, sku))
+
+    def plan(self, start: tuple[str, str], end: tuple[str, str], owned=None,
+             steps: int | None = None) -> list[tuple[float, tuple[str, str]]]:
+        """(delta E from the previous skein, key) for each skein from start to end.
+
+        owned: optional set of keys to restrict the intermediate skeins to, the ends are
+        always included.
+        steps: most steps to take, by default about one per STEP_DELTA_E of the whole run.
+        """
+        graph = self.graph
+        if owned is not None:
+            keys = set(owned) | {start, end}
+            graph = NeighbourGraph(((key, self.graph.labs[key]) for key in keys if key in self.graph.labs), self.k)
+        for key in (start, end):
+            if key not in graph.labs:
+                raise KeyError(f"unknown skein {key[0]} {key[1]}")
+
+        if not steps:
+            steps = round(delta_e(graph.labs[start], graph.labs[end]) / self.STEP_DELTA_E)
+        route = graph.path(start, end, max(1, steps))
+        steps = [(0.0, start)]
+        for before, after in zip(route, route[1:]):
+            steps.append((delta_e(graph.labs[before], graph.labs[after]), after))
+        return steps
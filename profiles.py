@@ -0,0 +1,213 @@
+import json
+import os
+from collections import Counter
+from itertools import chain
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+DEFAULT_PROFILE = "Default"
+# Pseudo profile summing every real one, read only
+ALL_PROFILES = "All Profiles"
+
+
+class Profile:
+    """Counts for one location or project, a sparse map from catalog position to count."""
+
+    __slots__ = ('name', 'counts')
+
+    def __init__(self, name: str, counts: dict[int, int] | None = None):
+        self.name = name
+        self.counts: dict[int, int] = counts or {}
+
+    def get(self, position: int) -> int:
+        return self.counts.get(position, 0)
+
+    def set(self, position: int, count: int):
+        # Zero counts are not stored, most of a catalog is never owned
+        if count:
+            self.counts[position] = count
+        else:
+            self.counts.pop(position, None)
+
+
+class ProfileSet:
+    """Named inventory profiles over one shared Catalog.
+
+    Counts are indexed by Catalog.position, so switching profiles only changes which sparse
+    map is read. On disk they are keyed by brand and SKU, because positions depend on the
+    order catalogs were loaded in.
+    """
+
+    def __init__(self, catalog, path: str = "profiles.json"):
+        self.catalog = catalog
+        self.path = path
+        self.profiles: dict[str, Profile] = {DEFAULT_PROFILE: Profile(DEFAULT_PROFILE)}
+        self.active = DEFAULT_PROFILE
+        self._aggregate: dict[int, int] | None = None
+
+    @property
+    def read_only(self) -> bool:
+        return self.active == ALL_PROFILES
+
+    def names(self) -> list[str]:
+        return list(self.profiles)
+
+    def load(self, legacy_path: str = "library.json"):
+        """Read profiles.json, or turn an existing library.json into the default profile."""
+        path = self.path if os.path.exists(self.path) else legacy_path
+        if not os.path.exists(path):
+            print("Profiles file not found, starting with an empty default profile.")
+            return
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error loading profiles: {e}")
+            return
+
+        if path == legacy_path:
+            print(f"Migrating {legacy_path} to the '{DEFAULT_PROFILE}' profile.")
+            data = {"active": DEFAULT_PROFILE, "profiles": {DEFAULT_PROFILE: data}}
+
+        self.profiles = {}
+        for name, library in data.get("profiles", {}).items():
+            profile = self.profiles[name] = Profile(name)
+            for brand, counts in library.items():
+                for sku, count in counts.items():
+                    profile.set(self.catalog.position(brand, sku), int(count))
+        if not self.profiles:
+            self.profiles[DEFAULT_PROFILE] = Profile(DEFAULT_PROFILE)
+        active = data.get("active")
+        self.active = active if active in self.profiles or active == ALL_PROFILES else next(iter(self.profiles))
+        self._aggregate = None
+
+    def save(self):
+        profiles = {}
+        for name, profile in self.profiles.items():
+            library: dict[str, dict[str, int]] = {}
+            for position, count in sorted(profile.counts.items()):
+                brand, sku = self.catalog.keys[position]
+                library.setdefault(brand, {})[sku] = count
+            profiles[name] = library
+
+        # Written beside the real file and swapped in, so a crash never leaves half a file
+        temporary = self.path + ".tmp"
+        with open(temporary, 'w') as f:
+            json.dump({"active": self.active, "profiles": profiles}, f, indent=4)
+        os.replace(temporary, self.path)
+
+    def profile(self, name: str | None = None) -> Profile:
+        name = self.active if name is None else name
+        if name not in self.profiles:
+            raise KeyError(f"unknown profile '{name}'")
+        return self.profiles[name]
+
+    def get_count(self, brand: str, sku: str, profile: str | None = None) -> int:
+        position = self.catalog.positions.get((brand, sku))
+        if position is None:
+            return 0
+        if (self.active if profile is None else profile) == ALL_PROFILES:
+            return self.aggregate().get(position, 0)
+        return self.profile(profile).get(position)
+
+    def set_count(self, brand: str, sku: str, count: int, profile: str | None = None) -> int:
+        """Set a count and return the previous one."""
+        if (self.active if profile is None else profile) == ALL_PROFILES:
+            raise ValueError(f"'{ALL_PROFILES}' is read only, switch to a profile to change counts")
+        target = self.profile(profile)
+        position = self.catalog.position(brand, sku)
+        old = target.get(position)
+        target.set(position, count)
+        self._aggregate = None
+        return old
+
+    def transfer(self, brand: str, sku: str, amount: int, source: str, target: str):
+        """Move skeins between profiles; nothing changes unless the whole move is possible."""
+        if source == target:
+            raise ValueError("source and target profile are the same")
+        if amount <= 0:
+            raise ValueError("amount must be positive")
+        source_profile, target_profile = self.profile(source), self.profile(target)
+        position = self.catalog.position(brand, sku)
+        available = source_profile.get(position)
+        if available < amount:
+            raise ValueError(f"'{source}' only has {available} of {brand} {sku}")
+        source_profile.set(position, available - amount)
+        target_profile.set(position, target_profile.get(position) + amount)
+        self._aggregate = None
+
+    def aggregate(self) -> dict[int, int]:
+        """Summed counts of every profile, cached until a count changes."""
+        if self._aggregate is None:
+            profiles = list(self.profiles.values())
+            if numpy is not None and len(profiles) > 1:
+                positions = numpy.fromiter(chain.from_iterable(p.counts.keys() for p in profiles), dtype=numpy.int64)
+                counts = numpy.fromiter(chain.from_iterable(p.counts.values() for p in profiles), dtype=numpy.int64)
+                totals = numpy.bincount(positions, weights=counts, minlength=len(self.catalog.keys)).astype(numpy.int64)
+                owned = numpy.flatnonzero(totals)
+                self._aggregate = dict(zip(owned.tolist(), totals[owned].tolist()))
+            else:
+                totals = Counter()
+                for profile in profiles:
+                    totals.update(profile.counts)
+                self._aggregate = {position: count for position, count in totals.items() if count}
+        return self._aggregate
+
+    def switch(self, name: str):
+        if name != ALL_PROFILES:
+            self.profile(name)
+        self.active = name
+
+    def check_name(self, name: str) -> str:
+        name = name.strip()
+        if not name:
+            raise ValueError("profile name is empty")
+        if name == ALL_PROFILES or name in self.profiles:
+            raise ValueError(f"a profile named '{name}' already exists")
+        return name
+
+    def create(self, name: str) -> Profile:
+        name = self.check_name(name)
+        profile = self.profiles[name] = Profile(name)
+        return profile
+
+    def rename(self, old: str, new: str):
+        profile = self.profile(old)
+        new = self.check_name(new)
+        # Rebuilt to keep the menu order
+        self.profiles = {new if name == old else name: value for name, value in self.profiles.items()}
+        profile.name = new
+        if self.active == old:
+            self.active = new
+
+    def remove(self, name: str):
+        self.profile(name)
+        if len(self.profiles) == 1:
+            raise ValueError("the last profile cannot be deleted")
+        del self.profiles[name]
+        if self.active == name:
+            self.active = next(iter(self.profiles))
+        self._aggregate = None
+
+    def remove_skein(self, brand: str, sku: str) -> dict[str, int]:
+        """Drop a skein from every profile and return what each one held."""
+        position = self.catalog.positions.get((brand, sku))
+        removed = {}
+        if position is None:
+            return removed
+        for name, profile in self.profiles.items():
+            count = profile.counts.pop(position, 0)
+            if count:
+                removed[name] = count
+        self._aggregate = None
+        return removed
+
+    def restore_skein(self, brand: str, sku: str, counts: dict[str, int]):
+        position = self.catalog.position(brand, sku)
+        for name, count in counts.items():
+            if name in self.profiles:
+                self.profiles[name].set(position, count)
+        self._aggregate = None
@@ -1,3 +1,7 @@
+import debug
+from color import ColorKeys, color_keys, representative_labs
+
+
 class Skein:    
     def __init__(self, brand: str, sku: str):
         self.brand = brand
@@ -5,18 +9,58 @@ class Skein:
         self.name: str = 'no name'
         self.color: list[list[int]] = [[0, 0, 0]]
         self.material: str = 'cotton'
+        self.lab: tuple[float, float, float] | None = None
+        self.color_keys: ColorKeys | None = None
+        debug.track('Skein', self)
+
+    def update_color_keys(self, lab=None):
+        # Precomputed so the colour sort modes cost no more than sorting by name
+        self.lab = lab if lab is not None else representative_labs([self.color])[0]
+        self.color_keys = color_keys(self.lab)
+
+    def to_dict(self) -> dict:
+        return {'brand': self.brand, 'sku': self.sku, 'name': self.name,
+                'color': [list(color) for color in self.color], 'material': self.material}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Skein':
+        skein = cls(data['brand'], data['sku'])
+        skein.name = data.get('name', 'no name')
+        skein.color = [list(color) for color in data.get('color', [[255, 255, 255]])]
+        skein.material = data.get('material', 'cotton')
+        skein.update_color_keys()
+        return skein
 
 
 class Catalog:
     def __init__(self):
         self.skeins: dict[str, dict[str, Skein]] = {}
+        # Every skein seen gets a fixed position for the life of the process, inventory
+        # profiles index their counts by it. Positions of deleted skeins are not reused.
+        self.positions: dict[tuple[str, str], int] = {}
+        self.keys: list[tuple[str, str]] = []
+
+    def position(self, brand: str, sku: str) -> int:
+        key = (brand, sku)
+        position = self.positions.get(key)
+        if position is None:
+            position = self.positions[key] = len(self.keys)
+            self.keys.append(key)
+        return position
 
     def load_brand(self, brand: str, data: dict):
         if brand not in self.skeins:
             self.skeins[brand] = {}
+        loaded = []
         for sku, details in data.items():
             skein = Skein(brand, sku)
             skein.name = details.get('name', 'no name')
             skein.color = details.get('color', [[255, 255, 255]])
             skein.material = details.get('material', 'cotton')
             self.skeins[brand][sku] = skein
+            self.position(brand, sku)
+            loaded.append(skein)
+
+        # Convert every band of the brand in one batch
+        for skein, lab in zip(loaded, representative_labs([skein.color for skein in loaded])):
+            skein.update_color_keys(lab)
@@ -0,0 +1,70 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from color import skein_text_color
+
+PLACEHOLDER_COLOR = [200, 200, 200]
+
+
+def band_row(colors, width: int) -> bytes:
+    """One row of RGB pixels with the colours as equal vertical bands."""
+    colors = colors or [PLACEHOLDER_COLOR]
+    band_width = width / len(colors)
+    row = bytearray()
+    for i, (r, g, b) in enumerate(colors):
+        row += bytes((r, g, b)) * (round((i + 1) * band_width) - round(i * band_width))
+    return bytes(row)
+
+
+def band_pixels(colors, width: int, height: int) -> bytes:
+    return band_row(colors, width) * height
+
+
+class SwatchRenderer:
+    """Worker pool producing raw RGB swatch buffers and text colours away from the UI thread.
+
+    Each request belongs to an owner; a newer request, or `cancel`, supersedes whatever the
+    owner asked for before so a stale result is never delivered.
+    """
+
+    def __init__(self, workers: int = 2):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="swatch")
+        self.lock = threading.Lock()
+        self.jobs: dict[int, tuple[int, Future]] = {}
+        self.generation = 0
+
+    def request(self, owner, colors, width: int, height: int, deliver) -> int:
+        """Queue a swatch, `deliver(generation, pixels, width, height, text_color)` runs on the worker."""
+        colors = [list(color) for color in colors]
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+            previous = self.jobs.get(id(owner))
+            if previous:
+                previous[1].cancel()
+            future = self.executor.submit(self._render, id(owner), generation, colors, width, height, deliver)
+            self.jobs[id(owner)] = (generation, future)
+        return generation
+
+    def cancel(self, owner):
+        with self.lock:
+            job = self.jobs.pop(id(owner), None)
+        if job:
+            job[1].cancel()
+
+    def _render(self, key: int, generation: int, colors, width: int, height: int, deliver):
+        with self.lock:
+            job = self.jobs.get(key)
+            if not job or job[0] != generation:
+                return
+        pixels = band_pixels(colors, width, height)
+        text_color = skein_text_color(colors)
+        with self.lock:
+            job = self.jobs.get(key)
+            if not job or job[0] != generation:
+                return
+            del self.jobs[key]
+        deliver(generation, pixels, width, height, text_color)
+
+
+renderer = SwatchRenderer()
@@ -0,0 +1,121 @@
+import wx
+
+from atlas import AtlasJob, Glyph
+
+
+def build_glyphs(text: str, point_size: int = 18) -> dict[str, Glyph]:
+    """Render each distinct character once on the UI thread so the worker can stamp them into the atlas."""
+    font = wx.Font(point_size, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD)
+    dc = wx.MemoryDC(wx.Bitmap(1, 1))
+    dc.SetFont(font)
+
+    glyphs = {}
+    for char in sorted(set(text)):
+        width, height = dc.GetTextExtent(char)
+        width = max(1, width)
+        height = max(1, height)
+
+        bitmap = wx.Bitmap(width, height)
+        dc.SelectObject(bitmap)
+        dc.SetBackground(wx.BLACK_BRUSH)
+        dc.Clear()
+        dc.SetTextForeground(wx.WHITE)
+        dc.DrawText(char, 0, 0)
+        dc.SelectObject(wx.NullBitmap)
+
+        buffer = bytearray(width * height * 3)
+        bitmap.CopyToBuffer(buffer, wx.BitmapBufferFormat_RGB)
+
+        # Threshold the anti-aliased coverage into runs of solid pixels
+        rows = []
+        for y in range(height):
+            runs = []
+            start = None
+            for x in range(width):
+                covered = buffer[(y * width + x) * 3] > 127
+                if covered and start is None:
+                    start = x
+                elif not covered and start is not None:
+                    runs.append((start, x))
+                    start = None
+            if start is not None:
+                runs.append((start, width))
+            rows.append(runs)
+        glyphs[char] = Glyph(width, height, rows)
+
+    return glyphs
+
+
+class ColorCardExport:
+    SCOPES = ["Current view", "Library (owned skeins)", "Whole catalog"]
+
+    def __init__(self, window):
+        self.window = window
+        self.job: AtlasJob | None = None
+
+    def choose_skeins(self) -> list | None:
+        model = self.window.model
+        brands = sorted(model.catalog.skeins)
+        choices = self.SCOPES + [f"Brand: {brand.upper()}" for brand in brands]
+        with wx.SingleChoiceDialog(self.window, "Skeins to include:", "Export Color Card", choices) as dialog:
+            if dialog.ShowModal() != wx.ID_OK:
+                return None
+            selection = dialog.GetSelection()
+
+        if selection == 0:
+            # Visible panels in the current sort order
+            return [item.GetWindow().skein for item in self.window.grid_sizer.GetChildren()
+                    if item.GetWindow() and item.GetWindow().IsShown()]
+
+        all_skeins = [skein for brand in brands for skein in model.catalog.skeins[brand].values()]
+        if selection == 1:
+            return [skein for skein in all_skeins if model.get_count(skein.brand, skein.sku) > 0]
+        if selection == 2:
+            return all_skeins
+        return list(model.catalog.skeins[brands[selection - len(self.SCOPES)]].values())
+
+    def start(self):
+        if self.job and self.job.is_alive():
+            wx.MessageBox("A color card is already being exported.", "Export Color Card", wx.OK | wx.ICON_INFORMATION)
+            return
+
+        skeins = self.choose_skeins()
+        if skeins is None:
+            return
+        if not skeins:
+            wx.MessageBox("No skeins to export.", "Export Color Card", wx.OK | wx.ICON_WARNING)
+            return
+
+        with wx.FileDialog(self.window, "Export color card", defaultFile="color_card.png",
+                           wildcard="PNG image (*.png)|*.png|PDF document (*.pdf)|*.pdf",
+                           style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT) as dialog:
+            if dialog.ShowModal() != wx.ID_OK:
+                return
+            path = dialog.GetPath()
+            extension = ".pdf" if dialog.GetFilterIndex() == 1 else ".png"
+            if not path.lower().endswith(extension):
+                path += extension
+
+        text = "".join(skein.brand.upper() + skein.sku + skein.name for skein in skeins)
+        self.job = AtlasJob(skeins, path, build_glyphs(text),
+                            progress=lambda done, total: wx.CallAfter(self.on_progress, done, total),
+                            finished=lambda error: wx.CallAfter(self.on_finished, path, error))
+        self.job.start()
+
+    def cancel(self):
+        if self.job:
+            self.job.cancel()
+            # Cancelling stops at the next strip or page; waiting lets the job remove its temporary file before exit
+            self.job.join(timeout=5)
+
+    def on_progress(self, done: int, total: int):
+        if self.window:
+            self.window.SetStatusText(f"Exporting color card... {done}/{total} skeins")
+
+    def on_finished(self, path: str, error: str | None):
+        if not self.window:
+            return
+        if error:
+            self.window.SetStatusText(f"Color card export failed: {error}")
+        else:
+            self.window.SetStatusText(f"Color card saved to {path}")
@@ -0,0 +1,89 @@
+import wx
+
+import debug
+
+
+class LatencyDialog(wx.Dialog):
+    def __init__(self, parent):
+        super().__init__(parent, title="Latency Report", size=wx.Size(800, 400), style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+        sizer = wx.BoxSizer(wx.VERTICAL)
+
+        self.text_ctrl = wx.TextCtrl(self, style=wx.TE_MULTILINE | wx.TE_READONLY | wx.TE_DONTWRAP)
+        font = wx.Font(10, wx.FONTFAMILY_TELETYPE, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL)
+        self.text_ctrl.SetFont(font)
+        sizer.Add(self.text_ctrl, 1, wx.EXPAND | wx.ALL, 10)
+
+        button_sizer = wx.BoxSizer()
+        refresh_button = wx.Button(self, label="Refresh")
+        refresh_button.Bind(wx.EVT_BUTTON, lambda event: self.refresh())
+        reset_button = wx.Button(self, label="Reset")
+        reset_button.Bind(wx.EVT_BUTTON, self.on_reset)
+        threshold_button = wx.Button(self, label="Slow Threshold...")
+        threshold_button.Bind(wx.EVT_BUTTON, self.on_threshold)
+        close_button = wx.Button(self, wx.ID_CANCEL, label="Close")
+        for button in (refresh_button, reset_button, threshold_button, close_button):
+            button_sizer.Add(button, 0, wx.ALL, 5)
+        sizer.Add(button_sizer, 0, wx.ALIGN_RIGHT | wx.RIGHT | wx.BOTTOM, 5)
+
+        self.SetSizer(sizer)
+        self.refresh()
+
+    def refresh(self):
+        tracer = debug.tracer
+        lines = [f"Slow threshold: {tracer.slow_ms:.0f} ms | Samples: {len(tracer.samples)}", "",
+                 f"{'Path':<40}{'Calls':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+        for path, calls, p50, p95, longest in tracer.report():
+            lines.append(f"{path:<40}{calls:>8}{p50:>10.2f}{p95:>10.2f}{longest:>10.2f}")
+            lines.append(f"    {tracer.histogram_text(path)}")
+        self.text_ctrl.SetValue("\n".join(lines))
+
+    def on_reset(self, event):
+        debug.tracer.reset()
+        self.refresh()
+
+    def on_threshold(self, event):
+        value = wx.GetNumberFromUser("Log handlers slower than (ms):", "", "Slow Threshold",
+                                     int(debug.tracer.slow_ms), 1, 10000, self)
+        if value != -1:
+            debug.tracer.slow_ms = float(value)
+            self.refresh()
+
+
+class MemoryDialog(wx.Dialog):
+    def __init__(self, parent, model):
+        super().__init__(parent, title="Memory Report", size=wx.Size(900, 500), style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+        self.model = model
+        sizer = wx.BoxSizer(wx.VERTICAL)
+
+        self.text_ctrl = wx.TextCtrl(self, style=wx.TE_MULTILINE | wx.TE_READONLY | wx.TE_DONTWRAP)
+        font = wx.Font(10, wx.FONTFAMILY_TELETYPE, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL)
+        self.text_ctrl.SetFont(font)
+        sizer.Add(self.text_ctrl, 1, wx.EXPAND | wx.ALL, 10)
+
+        button_sizer = wx.BoxSizer()
+        checkpoint_button = wx.Button(self, label="Checkpoint")
+        checkpoint_button.Bind(wx.EVT_BUTTON, self.on_checkpoint)
+        refresh_button = wx.Button(self, label="Refresh")
+        refresh_button.Bind(wx.EVT_BUTTON, lambda event: self.refresh())
+        close_button = wx.Button(self, wx.ID_CANCEL, label="Close")
+        for button in (checkpoint_button, refresh_button, close_button):
+            button_sizer.Add(button, 0, wx.ALL, 5)
+        sizer.Add(button_sizer, 0, wx.ALIGN_RIGHT | wx.RIGHT | wx.BOTTOM, 5)
+
+        self.SetSizer(sizer)
+        self.refresh()
+
+    def on_checkpoint(self, event):
+        debug.memory.checkpoint(f"checkpoint {len(debug.memory.checkpoints) + 1}")
+        self.refresh()
+
+    def refresh(self):
+        self.text_ctrl.SetValue(debug.memory.report(self.model))
+
+
+def latency_hud_text() -> str:
+    """One line of the slowest traced paths for the status bar."""
+    rows = debug.tracer.report()[:3]
+    if not rows:
+        return "No traced calls yet"
+    return " | ".join(f"{path} p50 {p50:.1f} p95 {p95:.1f} max {longest:.1f} ms" for path, calls, p50, p95, longest in rows)
@@ -1,5 +1,10 @@
+import time
+
 import wx
 
+import debug
+from swatch import PLACEHOLDER_COLOR, renderer
+
 
 class ColorDisplayPanel(wx.Panel):
     def __init__(self, parent, skein):
@@ -7,52 +12,84 @@ class ColorDisplayPanel(wx.Panel):
         self.skein = skein
         self.SetMinSize(wx.Size(100, 400))
         self.Bind(wx.EVT_PAINT, self.on_paint)
-        self.average_lightness = self.calculate_average_lightness(self.skein.color)
+        self.Bind(wx.EVT_SIZE, self.on_size)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
         self.render_buffer: wx.Bitmap | None = None
+        # Generation of the swatch job in flight, results from any other generation are stale
+        self.pending_generation: int | None = None
+        debug.track('ColorDisplayPanel', self, self.buffer_bytes)
+
+    @staticmethod
+    def buffer_bytes(panel) -> int:
+        buffer = panel.render_buffer
+        if not buffer or not buffer.IsOk():
+            return 0
+        return buffer.GetWidth() * buffer.GetHeight() * 4
 
     def on_paint(self, event):
         dc = wx.PaintDC(self)
-        if not self.render_buffer:
-            self.render()
-        dc.DrawBitmap(self.render_buffer, 0, 0)
+        if self.render_buffer:
+            dc.DrawBitmap(self.render_buffer, 0, 0)
+        else:
+            # Flat placeholder until the worker has produced the swatch
+            width, height = self.GetSize()
+            dc.SetPen(wx.TRANSPARENT_PEN)
+            dc.SetBrush(wx.Brush(wx.Colour(*(self.skein.color or [PLACEHOLDER_COLOR])[0])))
+            dc.DrawRectangle(0, 0, width, height)
+            if self.pending_generation is None:
+                self.request_render()
         event.Skip()
 
-    def render(self):
-        width, height = self.GetSize()
-        self.render_buffer = wx.Bitmap(width, height)
-
-        dc = wx.MemoryDC(self.render_buffer)
+    def on_size(self, event):
+        if self.render_buffer and self.render_buffer.GetSize() != self.GetSize():
+            self.render_buffer = None
+        if self.pending_generation is not None:
+            # Layout changed, whatever is queued is for the old size
+            renderer.cancel(self)
+            self.pending_generation = None
+        self.Refresh(eraseBackground=False)
+        event.Skip()
 
-        dc.SetPen(wx.TRANSPARENT_PEN)
-        dc.DrawRectangle(0, 0, width, height)
+    def invalidate(self):
+        """Drop the rendered swatch, e.g. after the skein's colours changed"""
+        self.render_buffer = None
+        renderer.cancel(self)
+        self.pending_generation = None
+        self.Refresh(eraseBackground=False)
 
-        # Draw border
-        dc.DrawRectangle(0, 0, width, height)
+    def on_destroy(self, event):
+        if event.GetEventObject() is self:
+            renderer.cancel(self)
+        event.Skip()
 
-        # Draw color bands
-        colors = self.skein.color
-        if not colors:
-            colors = [[200, 200, 200]]  # Default gray if no color
+    def request_render(self):
+        width, height = self.GetSize()
+        if width <= 0 or height <= 0:
+            return
+        self.pending_generation = renderer.request(
+            self, self.skein.color, width, height,
+            lambda *result: wx.CallAfter(self.on_swatch_ready, *result))
 
-        num_colors = len(colors)
-        if num_colors == 1:
-            # Single color - fill the whole area
-            r, g, b = colors[0]
-            dc.SetBrush(wx.Brush(wx.Colour(r, g, b)))
-            dc.DrawRectangle(0, 0, width, height)
-        else:
-            # Multiple colors - draw horizontal bands
-            band_width = width / num_colors
-            for i, color in enumerate(colors):
-                r, g, b = color
-                dc.SetBrush(wx.Brush(wx.Colour(r, g, b)))
-                dc.DrawRectangle(int(i * band_width), 0, int(band_width) + 1, height)
+    def on_swatch_ready(self, generation, pixels, width, height, text_color):
+        # The panel may have been destroyed or resized while the job ran
+        if not self or generation != self.pending_generation:
+            return
+        self.pending_generation = None
+        self.render(wx.Bitmap.FromBuffer(width, height, pixels), text_color)
+        self.Refresh(eraseBackground=False)
+
+    @debug.timed("ColorDisplayPanel.render")
+    def render(self, bitmap: wx.Bitmap, text_color):
+        """Draw the text over a swatch bitmap from the worker and keep it as the render buffer"""
+        width, height = bitmap.GetWidth(), bitmap.GetHeight()
+        self.render_buffer = bitmap
+        dc = wx.MemoryDC(self.render_buffer)
 
         # Create a transparent DC for drawing text
         gc = wx.GraphicsContext.Create(dc)
         if gc:
-            # Calculate text color based on average lightness
-            text_color = wx.BLACK if self.average_lightness > 0.5 else wx.WHITE
+            # Black or white text, whichever contrasts more with the bands
+            text_color = wx.Colour(*text_color)
 
             # Set font and text color
             font = wx.Font(9, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD)
@@ -110,20 +147,6 @@ class ColorDisplayPanel(wx.Panel):
                 gc.DrawText(line, text_x, current_y)
                 current_y += h + line_spacing
 
-    @staticmethod
-    def calculate_average_lightness(colors):
-        """Calculate the average lightness of the colors"""
-        if not colors:
-            return 0.5  # Default middle lightness
-
-        total_lightness = 0
-        for color in colors:
-            r, g, b = color
-            lightness = wx.Colour(r, g, b).GetLuminance()
-            total_lightness += lightness
-
-        return total_lightness / len(colors)
-
 
 class SkeinPanel(wx.Panel):
     EDIT_SKEIN = None
@@ -136,6 +159,8 @@ class SkeinPanel(wx.Panel):
         self.brand = skein.brand
         self.sku = skein.sku
         self.is_visible = True
+        self.read_only = False
+        debug.track('SkeinPanel', self, lambda panel: 0)
 
         self.SetMinSize(wx.Size(150, 200))
 
@@ -182,11 +207,16 @@ class SkeinPanel(wx.Panel):
             return
         if hasattr(parent, 'skein_panels') and (brand, sku) in parent.skein_panels:
             # Panel still exists, safe to refresh
-            self.color_panel.render_buffer = None
-            self.color_panel.Refresh()
+            self.color_panel.invalidate()
 
         event.Skip()
 
+    def set_read_only(self, read_only: bool):
+        # Counts can be viewed but not changed while all profiles are summed
+        self.read_only = read_only
+        for control in (self.minus_button, self.value_text, self.plus_button):
+            control.Enable(not read_only)
+
     def _decrease_value(self, event):
         current = int(self.value_text.GetValue())
         if current > 0:
@@ -212,13 +242,91 @@ class SkeinPanel(wx.Panel):
             self.COUNT_CHANGE(self.brand, self.sku, new_value)
 
 
+class SamplerMagnifier(wx.PopupWindow):
+    ZOOM = 6
+
+    def __init__(self, parent, side: int):
+        super().__init__(parent)
+        self.zoomed: wx.Bitmap | None = None
+        self.radius = 0
+        self.side = side
+        self.color = [0, 0, 0]
+        self.matches: list[str] = []
+        debug.track('SamplerMagnifier', self, lambda popup: 0)
+
+        zoom_size = side * self.ZOOM
+        self.SetSize(wx.Size(zoom_size + 160, zoom_size))
+        self.Bind(wx.EVT_PAINT, self.on_paint)
+
+    def update(self, sample: wx.Bitmap, radius: int, color, matches: list[str] | None):
+        zoom_size = self.side * self.ZOOM
+        # Nearest-neighbour scaling keeps individual screen pixels visible
+        self.zoomed = wx.Bitmap(sample.ConvertToImage().Scale(zoom_size, zoom_size, wx.IMAGE_QUALITY_NORMAL))
+        self.radius = radius
+        self.color = color
+        if matches is not None:
+            self.matches = matches
+        self.Refresh(eraseBackground=False)
+
+    def on_paint(self, event):
+        dc = wx.PaintDC(self)
+        zoom_size = self.side * self.ZOOM
+        width, height = self.GetSize()
+
+        dc.SetBackground(wx.WHITE_BRUSH)
+        dc.Clear()
+        if self.zoomed:
+            dc.DrawBitmap(self.zoomed, 0, 0)
+
+        # Outline the sampled region
+        centre = self.side // 2
+        dc.SetPen(wx.Pen(wx.BLACK, 1))
+        dc.SetBrush(wx.TRANSPARENT_BRUSH)
+        dc.DrawRectangle((centre - self.radius) * self.ZOOM, (centre - self.radius) * self.ZOOM,
+                         (2 * self.radius + 1) * self.ZOOM, (2 * self.radius + 1) * self.ZOOM)
+
+        # Sampled colour and the closest skeins
+        dc.SetPen(wx.TRANSPARENT_PEN)
+        dc.SetBrush(wx.Brush(wx.Colour(*self.color)))
+        dc.DrawRectangle(zoom_size + 5, 5, width - zoom_size - 10, 30)
+
+        dc.SetTextForeground(wx.BLACK)
+        dc.SetFont(wx.Font(8, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL))
+        dc.DrawText(f"Radius {self.radius}px (scroll)", zoom_size + 5, 40)
+        text_y = 58
+        for line in self.matches:
+            dc.DrawText(line, zoom_size + 5, text_y)
+            text_y += 16
+            if text_y > height - 14:
+                break
+
+
 class ColorPanel(wx.Panel):
-    def __init__(self, parent, color: wx.Colour):
+    # Timer interval caps the sampler frame rate, matches are looked up less often still
+    SAMPLE_INTERVAL = 33
+    MATCH_INTERVAL = 200
+    MAX_RADIUS = 10
+
+    def __init__(self, parent, color: wx.Colour, matcher=None):
         super().__init__(parent, size=wx.Size(50, 50))
         self.color = list(wx.Colour(color).Get())
         self.SetMinSize(wx.Size(50, 50))
         self.SetMaxSize(wx.Size(50, 50))
         self.picking = False
+        # Called with an RGB colour, returns (delta E, skein) pairs for the live preview
+        self.matcher = matcher
+        self.sample_radius = 2
+
+        # Screen region is grabbed into the same bitmap and byte buffer every tick
+        self.sample_side = 2 * self.MAX_RADIUS + 1
+        self.sample_bitmap: wx.Bitmap | None = None
+        self.sample_buffer = bytearray(self.sample_side * self.sample_side * 3)
+        self.screen_dc: wx.ScreenDC | None = None
+        self.magnifier: SamplerMagnifier | None = None
+        self.last_match_time = 0
+        self.last_match_color = None
+
+        debug.track('ColorPanel', self, lambda panel: 0)
 
         # Create timer for screen color sampling
         self.timer = wx.Timer(self)
@@ -228,6 +336,7 @@ class ColorPanel(wx.Panel):
         self.Bind(wx.EVT_PAINT, self.on_paint)
         self.Bind(wx.EVT_LEFT_DOWN, self.start_picking)
         self.Bind(wx.EVT_LEFT_UP, self.stop_picking)
+        self.Bind(wx.EVT_MOUSEWHEEL, self.on_wheel)
         
         # Bind right-click for Windows users to open native color dialog
         if 'wxMSW' in wx.PlatformInfo:
@@ -272,24 +381,74 @@ class ColorPanel(wx.Panel):
                 self.CaptureMouse()
                 self.Bind(wx.EVT_LEFT_DOWN, self.stop_picking)
                 self.Bind(wx.EVT_RIGHT_DOWN, self.stop_picking)
+
+                self.screen_dc = wx.ScreenDC()
+                if self.sample_bitmap is None:
+                    self.sample_bitmap = wx.Bitmap(self.sample_side, self.sample_side)
+                self.magnifier = SamplerMagnifier(wx.GetTopLevelParent(self), self.sample_side)
+                self.last_match_color = None
+
                 # Start timer for color sampling
-                self.timer.Start(50)  # Update every 50ms
+                self.timer.Start(self.SAMPLE_INTERVAL)
 
         event.Skip()
 
+    def on_wheel(self, event):
+        if self.picking:
+            step = 1 if event.GetWheelRotation() > 0 else -1
+            self.sample_radius = min(self.MAX_RADIUS, max(0, self.sample_radius + step))
+
     def on_timer(self, event):
         if self.picking:
             # Get screen position
             x, y = wx.GetMousePosition()
 
-            # Get color at current position
-            dc = wx.ScreenDC()
-            color = dc.GetPixel(x, y)
+            # Grab the region around the cursor into the reusable buffer
+            side = self.sample_side
+            dc = wx.MemoryDC(self.sample_bitmap)
+            dc.Blit(0, 0, side, side, self.screen_dc, x - self.MAX_RADIUS, y - self.MAX_RADIUS)
+            dc.SelectObject(wx.NullBitmap)
+            self.sample_bitmap.CopyToBuffer(self.sample_buffer, wx.BitmapBufferFormat_RGB)
 
             # Update preview
-            self.color = list(color.Get())
+            self.color = self.region_median(self.sample_buffer, side, self.sample_radius)
             self.Refresh()
 
+            self.magnifier.update(self.sample_bitmap, self.sample_radius, self.color, self.find_matches())
+            self.magnifier.Position(wx.Point(x, y), wx.Size(20, 20))
+            if not self.magnifier.IsShown():
+                self.magnifier.Show()
+
+    def find_matches(self) -> list[str] | None:
+        """Closest skeins for the current colour, or None when it is too soon to look again"""
+        if not self.matcher or self.color == self.last_match_color:
+            return None
+        now = time.monotonic() * 1000
+        if now - self.last_match_time < self.MATCH_INTERVAL:
+            return None
+        self.last_match_time = now
+        self.last_match_color = self.color
+        return [f"{skein.brand.upper()} {skein.sku} \u0394E {distance:.1f}" for distance, skein in self.matcher(self.color, 5)]
+
+    @staticmethod
+    def region_median(buffer: bytearray, side: int, radius: int) -> list[int]:
+        """Per-channel median of the square of the given radius at the centre of an RGB buffer.
+
+        The median ignores the odd highlight or shadow fibre that a single pixel or a mean would pick up.
+        """
+        centre = side // 2
+        stride = side * 3
+        reds, greens, blues = bytearray(), bytearray(), bytearray()
+        for row in range(centre - radius, centre + radius + 1):
+            start = row * stride + (centre - radius) * 3
+            end = start + (2 * radius + 1) * 3
+            reds += buffer[start:end:3]
+            greens += buffer[start + 1:end:3]
+            blues += buffer[start + 2:end:3]
+
+        middle = len(reds) // 2
+        return [sorted(reds)[middle], sorted(greens)[middle], sorted(blues)[middle]]
+
     def stop_picking(self, event):
         if self.picking:
             self.picking = False
@@ -303,6 +462,10 @@ class ColorPanel(wx.Panel):
             self.Unbind(wx.EVT_RIGHT_DOWN)
 
             self.timer.Stop()
+            self.screen_dc = None
+            if self.magnifier:
+                self.magnifier.Destroy()
+                self.magnifier = None
         event.Skip()
         
     def open_color_dialog(self, event):
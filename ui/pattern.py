@@ -0,0 +1,173 @@
+from pathlib import Path
+
+import wx
+import wx.grid
+
+from pattern import Pattern, load_pattern, parse_pattern, shortage_report, write_shopping_list
+
+
+class PatternDialog(wx.Dialog):
+    COLUMNS = ["Brand", "SKU", "Name", "Needed", "Owned", "Short", "Patterns"]
+
+    def __init__(self, parent, model, patterns: list[Pattern]):
+        super().__init__(parent, title="Pattern Shortages", size=wx.Size(800, 500), style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+        self.model = model
+        # Shared with the window so the queue survives closing the dialog
+        self.patterns = patterns
+        self.rows = []
+
+        main_sizer = wx.BoxSizer(wx.VERTICAL)
+        content_sizer = wx.BoxSizer()
+
+        # Pattern queue
+        queue_sizer = wx.BoxSizer(wx.VERTICAL)
+        queue_sizer.Add(wx.StaticText(self, label="Queued patterns:"), 0, wx.BOTTOM, 5)
+        self.pattern_list = wx.ListBox(self, size=wx.Size(180, -1))
+        queue_sizer.Add(self.pattern_list, 1, wx.EXPAND)
+
+        brand_sizer = wx.BoxSizer()
+        brand_sizer.Add(wx.StaticText(self, label="Default brand:\t"), 0, wx.ALIGN_CENTER_VERTICAL)
+        brands = sorted(self.model.catalog.skeins.keys()) or ['dmc']
+        self.brand_choice = wx.Choice(self, choices=[brand.upper() for brand in brands])
+        self.brand_choice.SetSelection(brands.index('dmc') if 'dmc' in brands else 0)
+        brand_sizer.Add(self.brand_choice, 1, wx.EXPAND)
+        queue_sizer.Add(brand_sizer, 0, wx.EXPAND | wx.TOP, 5)
+
+        import_button = wx.Button(self, label="Import CSV...")
+        import_button.Bind(wx.EVT_BUTTON, self.on_import)
+        paste_button = wx.Button(self, label="Paste List...")
+        paste_button.Bind(wx.EVT_BUTTON, self.on_paste)
+        remove_button = wx.Button(self, label="Remove")
+        remove_button.Bind(wx.EVT_BUTTON, self.on_remove)
+        for button in (import_button, paste_button, remove_button):
+            queue_sizer.Add(button, 0, wx.EXPAND | wx.TOP, 5)
+
+        content_sizer.Add(queue_sizer, 0, wx.EXPAND | wx.ALL, 10)
+
+        # Shortage grid
+        grid_sizer = wx.BoxSizer(wx.VERTICAL)
+        self.shortages_only = wx.CheckBox(self, label="Show shortages only")
+        self.shortages_only.SetValue(True)
+        self.shortages_only.Bind(wx.EVT_CHECKBOX, lambda event: self.update_grid())
+        grid_sizer.Add(self.shortages_only, 0, wx.BOTTOM, 5)
+
+        self.grid = wx.grid.Grid(self)
+        self.grid.CreateGrid(0, len(self.COLUMNS))
+        self.grid.EnableEditing(False)
+        self.grid.HideRowLabels()
+        for col, label in enumerate(self.COLUMNS):
+            self.grid.SetColLabelValue(col, label)
+        grid_sizer.Add(self.grid, 1, wx.EXPAND)
+
+        self.summary = wx.StaticText(self, label="")
+        grid_sizer.Add(self.summary, 0, wx.TOP, 5)
+
+        content_sizer.Add(grid_sizer, 1, wx.EXPAND | wx.TOP | wx.BOTTOM | wx.RIGHT, 10)
+        main_sizer.Add(content_sizer, 1, wx.EXPAND)
+
+        # Buttons
+        button_sizer = wx.BoxSizer()
+        export_button = wx.Button(self, label="Export Shopping List...")
+        export_button.Bind(wx.EVT_BUTTON, self.on_export)
+        close_button = wx.Button(self, wx.ID_CANCEL, label="Close")
+        button_sizer.Add(export_button, 0, wx.ALL, 5)
+        button_sizer.Add(close_button, 0, wx.ALL, 5)
+        main_sizer.Add(button_sizer, 0, wx.ALIGN_RIGHT | wx.RIGHT | wx.BOTTOM, 5)
+
+        self.SetSizer(main_sizer)
+        self.update_patterns()
+
+    @property
+    def default_brand(self) -> str:
+        return self.brand_choice.GetStringSelection().lower() or 'dmc'
+
+    def unique_name(self, name: str) -> str:
+        # Shortage allocations are keyed by pattern name, so queued names must not repeat
+        names = {pattern.name for pattern in self.patterns}
+        base, number = name, 2
+        if name.startswith("Pattern ") and name[8:].isdecimal():
+            base, number = "Pattern", int(name[8:]) + 1
+        while name in names:
+            name = f"{base} {number}" if base == "Pattern" else f"{base} ({number})"
+            number += 1
+        return name
+
+    def on_import(self, event):
+        with wx.FileDialog(self, "Import pattern floss list", wildcard="CSV files (*.csv)|*.csv|Text files (*.txt)|*.txt|All files|*",
+                           style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST | wx.FD_MULTIPLE) as dialog:
+            if dialog.ShowModal() != wx.ID_OK:
+                return
+            for path in dialog.GetPaths():
+                try:
+                    self.patterns.append(load_pattern(path, self.default_brand, self.model.catalog.skeins,
+                                                      self.unique_name(Path(path).stem)))
+                except Exception as e:
+                    wx.MessageBox(f"Error loading pattern {path}: {e}", "Error", wx.OK | wx.ICON_ERROR)
+        self.update_patterns()
+
+    def on_paste(self, event):
+        name = self.unique_name("Pattern 1")
+        with wx.TextEntryDialog(self, "Paste the floss list, one 'brand,sku,count', 'sku,name,count' or 'sku,count' per line:", "Paste Floss List",
+                                style=wx.TE_MULTILINE | wx.OK | wx.CANCEL) as dialog:
+            dialog.SetSize(wx.Size(400, 400))
+            if dialog.ShowModal() != wx.ID_OK:
+                return
+            pattern = parse_pattern(name, dialog.GetValue(), self.default_brand, self.model.catalog.skeins)
+
+        if not pattern.requirements:
+            wx.MessageBox("No floss entries found.", "Input Error", wx.OK | wx.ICON_WARNING)
+            return
+        self.patterns.append(pattern)
+        self.update_patterns()
+
+    def on_remove(self, event):
+        index = self.pattern_list.GetSelection()
+        if index != wx.NOT_FOUND:
+            del self.patterns[index]
+            self.update_patterns()
+
+    def on_export(self, event):
+        if not any(row.short for row in self.rows):
+            wx.MessageBox("Nothing to buy, the library covers every queued pattern.", "Shopping List", wx.OK | wx.ICON_INFORMATION)
+            return
+        with wx.FileDialog(self, "Export shopping list", defaultFile="shopping_list.csv", wildcard="CSV files (*.csv)|*.csv",
+                           style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT) as dialog:
+            if dialog.ShowModal() != wx.ID_OK:
+                return
+            try:
+                write_shopping_list(dialog.GetPath(), self.rows)
+            except Exception as e:
+                wx.MessageBox(f"Error saving shopping list: {e}", "Error", wx.OK | wx.ICON_ERROR)
+
+    def update_patterns(self):
+        labels = []
+        for pattern in self.patterns:
+            skipped = f", {pattern.skipped} lines skipped" if pattern.skipped else ""
+            labels.append(f"{pattern.name} ({sum(pattern.requirements.values())} skeins{skipped})")
+        self.pattern_list.Set(labels)
+        self.rows = shortage_report(self.model, self.patterns)
+        self.update_grid()
+
+    def update_grid(self):
+        rows = self.rows
+        if self.shortages_only.GetValue():
+            rows = [row for row in rows if row.short > 0]
+
+        self.grid.Freeze()
+        if self.grid.GetNumberRows():
+            self.grid.DeleteRows(0, self.grid.GetNumberRows())
+        self.grid.AppendRows(len(rows))
+        for index, row in enumerate(rows):
+            allocations = ", ".join(f"{name}: {short} short" if short else f"{name}: ok" for name, (reserved, short) in row.allocations.items())
+            values = [row.brand.upper(), row.sku, row.name if row.in_catalog else "(not in catalog)",
+                      row.needed, row.owned, row.short, allocations]
+            for col, value in enumerate(values):
+                self.grid.SetCellValue(index, col, str(value))
+            if row.short:
+                self.grid.SetCellTextColour(index, 5, wx.RED)
+        self.grid.AutoSizeColumns()
+        self.grid.Thaw()
+
+        to_buy = sum(row.short for row in self.rows)
+        short_skus = sum(1 for row in self.rows if row.short)
+        self.summary.SetLabel(f"Skeins to buy: {to_buy} | SKUs short: {short_skus} of {len(self.rows)}")
@@ -0,0 +1,141 @@
+import math
+
+import wx
+import wx.grid
+
+from swatch import PLACEHOLDER_COLOR
+
+
+class GradientStrip(wx.Panel):
+    """The planned skeins as equal bands of their first colour."""
+
+    def __init__(self, parent):
+        super().__init__(parent, size=wx.Size(-1, 60))
+        self.SetMinSize(wx.Size(-1, 60))
+        self.colors: list[list[int]] = []
+        self.Bind(wx.EVT_PAINT, self.on_paint)
+        self.Bind(wx.EVT_SIZE, self.on_size)
+
+    def set_colors(self, colors):
+        self.colors = colors
+        self.Refresh()
+
+    def on_size(self, event):
+        self.Refresh()
+        event.Skip()
+
+    def on_paint(self, event):
+        dc = wx.PaintDC(self)
+        width, height = self.GetSize()
+        dc.SetBackground(wx.WHITE_BRUSH)
+        dc.Clear()
+        if not self.colors:
+            return
+        dc.SetPen(wx.TRANSPARENT_PEN)
+        band_width = width / len(self.colors)
+        for i, color in enumerate(self.colors):
+            dc.SetBrush(wx.Brush(wx.Colour(*color)))
+            left = round(i * band_width)
+            dc.DrawRectangle(left, 0, round((i + 1) * band_width) - left, height)
+
+
+class GradientDialog(wx.Dialog):
+    COLUMNS = ["Brand", "SKU", "Name", "Step ΔE", "Count"]
+
+    def __init__(self, parent, model, start=None):
+        super().__init__(parent, title="Gradient Planner", size=wx.Size(640, 520), style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+        self.model = model
+        self.brands = sorted(model.catalog.skeins.keys()) or ['dmc']
+        sizer = wx.BoxSizer(wx.VERTICAL)
+
+        # From and to skeins
+        form = wx.FlexGridSizer(cols=3, vgap=5, hgap=10)
+        form.AddGrowableCol(2)
+        self.start_brand, self.start_sku = self.add_skein_row(form, "From:", start)
+        self.end_brand, self.end_sku = self.add_skein_row(form, "To:", None)
+        sizer.Add(form, 0, wx.EXPAND | wx.ALL, 10)
+
+        options_sizer = wx.BoxSizer()
+        self.owned_only = wx.CheckBox(self, label="Only skeins I own")
+        options_sizer.Add(self.owned_only, 0, wx.ALIGN_CENTER_VERTICAL)
+        options_sizer.Add(wx.StaticText(self, label="Steps (0 = auto):"), 0, wx.ALIGN_CENTER_VERTICAL | wx.LEFT, 20)
+        self.steps_spin = wx.SpinCtrl(self, min=0, max=50, initial=0)
+        options_sizer.Add(self.steps_spin, 0, wx.LEFT, 5)
+        options_sizer.AddStretchSpacer()
+        plan_button = wx.Button(self, label="Plan")
+        plan_button.Bind(wx.EVT_BUTTON, self.on_plan)
+        plan_button.SetDefault()
+        options_sizer.Add(plan_button, 0)
+        sizer.Add(options_sizer, 0, wx.EXPAND | wx.LEFT | wx.RIGHT, 10)
+
+        self.strip = GradientStrip(self)
+        sizer.Add(self.strip, 0, wx.EXPAND | wx.ALL, 10)
+
+        self.grid = wx.grid.Grid(self)
+        self.grid.CreateGrid(0, len(self.COLUMNS))
+        self.grid.EnableEditing(False)
+        self.grid.HideRowLabels()
+        for col, label in enumerate(self.COLUMNS):
+            self.grid.SetColLabelValue(col, label)
+        sizer.Add(self.grid, 1, wx.EXPAND | wx.LEFT | wx.RIGHT, 10)
+
+        self.summary = wx.StaticText(self, label="")
+        sizer.Add(self.summary, 0, wx.ALL, 10)
+
+        close_button = wx.Button(self, wx.ID_CANCEL, label="Close")
+        sizer.Add(close_button, 0, wx.ALIGN_RIGHT | wx.RIGHT | wx.BOTTOM, 10)
+        self.SetSizer(sizer)
+
+    def add_skein_row(self, form, label, skein):
+        brand_choice = wx.Choice(self, choices=[brand.upper() for brand in self.brands])
+        brand = skein.brand if skein else 'dmc'
+        brand_choice.SetSelection(self.brands.index(brand) if brand in self.brands else 0)
+        sku_text = wx.TextCtrl(self, value=skein.sku if skein else "")
+        form.Add(wx.StaticText(self, label=label), 0, wx.ALIGN_CENTER_VERTICAL)
+        form.Add(brand_choice, 0)
+        form.Add(sku_text, 1, wx.EXPAND)
+        return brand_choice, sku_text
+
+    def selected_key(self, brand_choice, sku_text) -> tuple[str, str] | None:
+        brand = self.brands[brand_choice.GetSelection()]
+        sku = sku_text.GetValue().strip()
+        if sku not in self.model.catalog.skeins.get(brand, {}):
+            wx.MessageBox(f"There is no {brand.upper()} {sku} in the catalog.", "Gradient Planner", wx.OK | wx.ICON_ERROR)
+            return None
+        return brand, sku
+
+    def on_plan(self, event):
+        start = self.selected_key(self.start_brand, self.start_sku)
+        if start is None:
+            return
+        end = self.selected_key(self.end_brand, self.end_sku)
+        if end is None:
+            return
+        # The neighbour graph is built on the first plan of the session
+        with wx.BusyCursor():
+            steps = self.model.plan_gradient(start, end, self.owned_only.GetValue(), self.steps_spin.GetValue())
+        self.show_steps(steps)
+
+    def show_steps(self, steps):
+        self.strip.set_colors([skein.color[0] if skein.color else PLACEHOLDER_COLOR for _, skein in steps])
+
+        self.grid.Freeze()
+        if self.grid.GetNumberRows():
+            self.grid.DeleteRows(0, self.grid.GetNumberRows())
+        self.grid.AppendRows(len(steps))
+        for index, (distance, skein) in enumerate(steps):
+            values = [skein.brand.upper(), skein.sku, skein.name, f"{distance:.1f}" if index else "-",
+                      str(self.model.get_count(skein.brand, skein.sku))]
+            for col, value in enumerate(values):
+                self.grid.SetCellValue(index, col, value)
+        self.grid.AutoSizeColumns()
+        self.grid.Thaw()
+
+        distances = [distance for distance, _ in steps[1:]]
+        if distances:
+            mean = sum(distances) / len(distances)
+            spread = math.sqrt(sum((distance - mean) ** 2 for distance in distances) / len(distances))
+            self.summary.SetLabel(f"{len(steps)} skeins | mean step {mean:.1f} ± {spread:.1f} "
+                                  f"| steps {min(distances):.1f} to {max(distances):.1f} ΔE")
+        else:
+            self.summary.SetLabel("Start and end are the same skein")
@@ -0,0 +1,73 @@
+import wx
+
+
+class TransferDialog(wx.Dialog):
+    def __init__(self, parent, model):
+        super().__init__(parent, title="Transfer Skeins", size=wx.Size(360, 280))
+        self.model = model
+        self.summary = ""
+        names = model.profiles.names()
+        self.brands = sorted(model.catalog.skeins.keys())
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        form = wx.FlexGridSizer(cols=2, vgap=5, hgap=10)
+        form.AddGrowableCol(1)
+
+        self.brand_choice = wx.Choice(self, choices=[brand.upper() for brand in self.brands])
+        self.brand_choice.SetSelection(self.brands.index('dmc') if 'dmc' in self.brands else 0)
+        self.sku_text = wx.TextCtrl(self)
+        self.amount_spin = wx.SpinCtrl(self, min=1, max=999, initial=1)
+        self.source_choice = wx.Choice(self, choices=names)
+        self.target_choice = wx.Choice(self, choices=names)
+        active = model.profiles.active
+        self.source_choice.SetSelection(names.index(active) if active in names else 0)
+        self.target_choice.SetSelection(1 if self.source_choice.GetSelection() == 0 else 0)
+        self.owned_text = wx.StaticText(self, label="")
+
+        for label, control in (("Brand:", self.brand_choice), ("SKU:", self.sku_text), ("Amount:", self.amount_spin),
+                               ("From:", self.source_choice), ("To:", self.target_choice), ("", self.owned_text)):
+            form.Add(wx.StaticText(self, label=label), 0, wx.ALIGN_CENTER_VERTICAL)
+            form.Add(control, 1, wx.EXPAND)
+        sizer.Add(form, 1, wx.EXPAND | wx.ALL, 10)
+
+        for control in (self.brand_choice, self.source_choice, self.target_choice):
+            control.Bind(wx.EVT_CHOICE, lambda event: self.update_owned())
+        self.sku_text.Bind(wx.EVT_TEXT, lambda event: self.update_owned())
+
+        button_sizer = wx.StdDialogButtonSizer()
+        ok_button = wx.Button(self, wx.ID_OK, label="Transfer")
+        ok_button.Bind(wx.EVT_BUTTON, self.on_transfer)
+        button_sizer.AddButton(ok_button)
+        button_sizer.AddButton(wx.Button(self, wx.ID_CANCEL))
+        button_sizer.Realize()
+        sizer.Add(button_sizer, 0, wx.ALIGN_RIGHT | wx.ALL, 10)
+
+        self.SetSizer(sizer)
+        self.update_owned()
+
+    def selection(self) -> tuple[str, str, str, str]:
+        brand = self.brands[self.brand_choice.GetSelection()] if self.brands else ''
+        return (brand, self.sku_text.GetValue().strip(),
+                self.source_choice.GetStringSelection(), self.target_choice.GetStringSelection())
+
+    def update_owned(self):
+        brand, sku, source, target = self.selection()
+        if sku not in self.model.catalog.skeins.get(brand, {}):
+            self.owned_text.SetLabel("Unknown skein")
+            return
+        self.owned_text.SetLabel(f"{source}: {self.model.get_count(brand, sku, source)} | "
+                                 f"{target}: {self.model.get_count(brand, sku, target)}")
+
+    def on_transfer(self, event):
+        brand, sku, source, target = self.selection()
+        amount = self.amount_spin.GetValue()
+        if sku not in self.model.catalog.skeins.get(brand, {}):
+            wx.MessageBox(f"There is no {brand.upper()} {sku} in the catalog.", "Transfer Skeins", wx.OK | wx.ICON_ERROR)
+            return
+        try:
+            self.model.transfer_skeins(brand, sku, amount, source, target)
+        except ValueError as e:
+            wx.MessageBox(str(e), "Transfer Skeins", wx.OK | wx.ICON_ERROR)
+            return
+        self.summary = f"Moved {amount} of {brand} - {sku} from {source} to {target}"
+        self.EndModal(wx.ID_OK)
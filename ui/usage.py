@@ -0,0 +1,48 @@
+import time
+
+import wx
+import wx.grid
+
+from usage import UsageAnalytics
+
+
+class UsageDialog(wx.Dialog):
+    COLUMNS = ["Brand", "SKU", "Name", "Count", f"Used {UsageAnalytics.RECENT_DAYS}d",
+               f"Used {UsageAnalytics.LONG_DAYS}d", "Used Total", "Per Month", "Runs Out"]
+
+    def __init__(self, parent, model):
+        super().__init__(parent, title=f"Usage Analytics - {model.profiles.active}", size=wx.Size(800, 500), style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+        self.model = model
+        sizer = wx.BoxSizer(wx.VERTICAL)
+
+        self.grid = wx.grid.Grid(self)
+        self.grid.CreateGrid(0, len(self.COLUMNS))
+        self.grid.EnableEditing(False)
+        self.grid.HideRowLabels()
+        for col, label in enumerate(self.COLUMNS):
+            self.grid.SetColLabelValue(col, label)
+        sizer.Add(self.grid, 1, wx.EXPAND | wx.ALL, 10)
+
+        close_button = wx.Button(self, wx.ID_CANCEL, label="Close")
+        sizer.Add(close_button, 0, wx.ALIGN_RIGHT | wx.RIGHT | wx.BOTTOM, 10)
+
+        self.SetSizer(sizer)
+        self.populate()
+
+    def populate(self):
+        rows = UsageAnalytics.consumption(self.model.usage, self.model)
+        month_days = 30
+
+        self.grid.Freeze()
+        self.grid.AppendRows(len(rows))
+        for index, row in enumerate(rows):
+            skein = self.model.catalog.skeins.get(row.brand, {}).get(row.sku)
+            run_out = "-"
+            if row.run_out is not None:
+                run_out = "now" if row.count == 0 else time.strftime("%Y-%m-%d", time.localtime(row.run_out))
+            values = [row.brand.upper(), row.sku, skein.name if skein else "", row.count, row.used_recent,
+                      row.used_long, row.used_total, f"{row.daily_rate * month_days:.1f}", run_out]
+            for col, value in enumerate(values):
+                self.grid.SetCellValue(index, col, str(value))
+        self.grid.AutoSizeColumns()
+        self.grid.Thaw()
@@ -1,13 +1,12 @@
 import wx
-import wx.grid
-import wx.adv
-import json
-import os
-import webbrowser
 
+import debug
 import updater
 from skein import Skein
+from undo import CountChange, TransferChange
+from profiles import ALL_PROFILES
 from ui.panel import ColorPanel, SkeinPanel
+from ui.atlas import ColorCardExport
 
 
 class AddSkeinDialog(wx.Dialog):
@@ -78,7 +77,7 @@ class AddSkeinDialog(wx.Dialog):
         button_sizer.AddButton(cancel_button)
         button_sizer.Realize()
 
-        main_sizer.Add(wx.StaticText(self, label='Left-click and drag to sample color from screen, right-click to open color dialog' if 'wxMSW' in wx.PlatformInfo else "Click on a panel to edit its colour"))
+        main_sizer.Add(wx.StaticText(self, label='Left-click and drag to sample color from screen, scroll to change the sample size, right-click to open color dialog' if 'wxMSW' in wx.PlatformInfo else "Click on a panel to edit its colour"))
         main_sizer.Add(button_sizer, 0, wx.EXPAND, 5)
 
         self.SetSizer(main_sizer)
@@ -86,7 +85,7 @@ class AddSkeinDialog(wx.Dialog):
         main_sizer.Fit(self)
 
     def add_color(self, event):
-        color_panel = ColorPanel(self.colors_panel, wx.WHITE)
+        color_panel = ColorPanel(self.colors_panel, wx.WHITE, self.model.nearest_skeins)
         self.color_panels.append(color_panel)
         self.colors_sizer.Add(color_panel, 0, wx.RIGHT, 5)
         self.colors_panel.Layout()
@@ -117,42 +116,19 @@ class AddSkeinDialog(wx.Dialog):
             wx.MessageBox("Brand and SKU are required.", "Input Error", wx.OK | wx.ICON_WARNING)
             return False
 
-        # Create or update brand file
-        brand_file = os.path.join("catalogs", f"{brand}.json")
-        brand_data = {}
-
-        # Load existing brand data if file exists
-        if os.path.exists(brand_file):
-            try:
-                with open(brand_file, 'r') as f:
-                    brand_data = json.load(f)
-            except Exception as e:
-                wx.MessageBox(f"Error loading brand file: {e}", "Error", wx.OK | wx.ICON_ERROR)
-                return False
-
-        # Add or update skein data
-        brand_data[sku] = {
-            "name": data["name"],
-            "color": data["color"]
-        }
+        skein = Skein(brand, sku)
+        skein.name = data["name"]
+        skein.color = data["color"]
 
-        # Save brand file
+        # Write the brand file and add to catalog
         try:
-            with open(brand_file, 'w') as f:
-                json.dump(brand_data, f, indent=4)
+            # Only the save is timed, the message boxes around it wait on the user
+            with debug.timing("AddSkeinDialog.save_skein"):
+                self.model.save_skein(skein)
         except Exception as e:
             wx.MessageBox(f"Error saving brand file: {e}", "Error", wx.OK | wx.ICON_ERROR)
             return False
 
-        # Add to catalog
-        if brand not in self.model.catalog.skeins:
-            self.model.catalog.skeins[brand] = {}
-
-        skein = Skein(brand, sku)
-        skein.name = data["name"]
-        skein.color = data["color"]
-        self.model.add_skein_to_catalog(skein)
-
         return True
 
 
@@ -179,6 +155,18 @@ class EditSkeinDialog(AddSkeinDialog):
         
         # Store the original skein for reference
         self.original_skein = skein
+
+        # Closest skeins in the other brands, inserted above the hint text
+        equivalents = self.model.equivalents.lookup(skein.brand, skein.sku)
+        if equivalents:
+            equivalents_sizer = wx.BoxSizer(wx.VERTICAL)
+            equivalents_sizer.Add(wx.StaticText(self, label="Equivalents:"), 0, wx.BOTTOM, 5)
+            for other, matches in equivalents.items():
+                text = ", ".join(f"{match} (\u0394E {distance:.1f})" for match, distance in matches)
+                equivalents_sizer.Add(wx.StaticText(self, label=f"{other.upper()}:\t{text}"), 0, wx.LEFT, 10)
+            main_sizer = self.GetSizer()
+            main_sizer.Insert(main_sizer.GetItemCount() - 2, equivalents_sizer, 0, wx.EXPAND | wx.ALL, 5)
+            main_sizer.Fit(self)
         
         # Add delete button
         button_sizer = self.GetSizer().GetItem(self.GetSizer().GetItemCount() - 1).GetSizer()
@@ -197,7 +185,7 @@ class EditSkeinDialog(AddSkeinDialog):
         sku = self.original_skein.sku
         name = self.original_skein.name
         
-        message = f"Are you sure you want to delete this skein?\n\nBrand: {brand.upper()}\nSKU: {sku}\nName: {name}\n\nThis will permanently remove it from the catalog."
+        message = f"Are you sure you want to delete this skein?\n\nBrand: {brand.upper()}\nSKU: {sku}\nName: {name}\n\nThis will remove it from the catalog. Use Edit > Undo to restore it."
         dialog = wx.MessageDialog(self, message, "Confirm Delete", wx.YES_NO | wx.ICON_WARNING)
         
         if dialog.ShowModal() == wx.ID_YES:
@@ -214,6 +202,11 @@ class EditSkeinDialog(AddSkeinDialog):
 class Window(wx.Frame):
     def __init__(self, skein_model, defaults: dict = None):
         self.skein_panels = {}
+        self.pattern_queue = []
+        # Pending UI refresh after requests from the instance server
+        self.remote_status = None
+        self.remote_regrid = False
+        self.color_card = ColorCardExport(self)
         import model
         super().__init__(parent=None, title="Skein Care", size=wx.Size(*(defaults.get('window_size', (875, 600)))))
 
@@ -228,6 +221,14 @@ class Window(wx.Frame):
         file_menu = wx.Menu()
         add_skein_item = file_menu.Append(wx.ID_ANY, "Add New Skein")
         self.Bind(wx.EVT_MENU, self.add_skein, add_skein_item)
+        pattern_item = file_menu.Append(wx.ID_ANY, "Pattern Shortages...")
+        self.Bind(wx.EVT_MENU, self.on_patterns, pattern_item)
+        usage_item = file_menu.Append(wx.ID_ANY, "Usage Analytics...")
+        self.Bind(wx.EVT_MENU, self.on_usage, usage_item)
+        gradient_item = file_menu.Append(wx.ID_ANY, "Gradient Planner...")
+        self.Bind(wx.EVT_MENU, self.on_gradient, gradient_item)
+        color_card_item = file_menu.Append(wx.ID_ANY, "Export Color Card...")
+        self.Bind(wx.EVT_MENU, lambda event: self.color_card.start(), color_card_item)
         file_menu.AppendSeparator()
 
         self.toggle_item = file_menu.AppendCheckItem(wx.ID_ANY, "Show Library Only")
@@ -236,12 +237,30 @@ class Window(wx.Frame):
 
         menubar.Append(file_menu, "&File")
 
+        edit_menu = wx.Menu()
+        undo_item = edit_menu.Append(wx.ID_UNDO, "&Undo\tCtrl+Z")
+        redo_item = edit_menu.Append(wx.ID_REDO, "&Redo\tCtrl+Y")
+        self.Bind(wx.EVT_MENU, self.on_undo, undo_item)
+        self.Bind(wx.EVT_MENU, self.on_redo, redo_item)
+        self.Bind(wx.EVT_UPDATE_UI, lambda event: event.Enable(self.model.undo.can_undo()), undo_item)
+        self.Bind(wx.EVT_UPDATE_UI, lambda event: event.Enable(self.model.undo.can_redo()), redo_item)
+        menubar.Append(edit_menu, "&Edit")
+
+        # Rebuilt whenever profiles are added, renamed or deleted
+        self.profile_menu = wx.Menu()
+        self.build_profile_menu()
+        menubar.Append(self.profile_menu, "&Profile")
+
         self.sort_menu = wx.Menu()
         # Define sort method constants
         self.SORT_BY_BRAND = 0
         self.SORT_BY_SKU = 1
         self.SORT_BY_NAME = 2
         self.SORT_BY_COUNT = 3
+        self.SORT_BY_HUE = 4
+        self.SORT_BY_LIGHTNESS = 5
+        self.SORT_BY_SATURATION = 6
+        self.SORT_BY_GRADIENT = 7
 
         # Create menu items with wx.ID_ANY and store their IDs
         self.sort_by_brand_item = self.sort_menu.AppendCheckItem(wx.ID_ANY, "Brand")
@@ -256,12 +275,34 @@ class Window(wx.Frame):
         self.sort_by_count_item = self.sort_menu.AppendCheckItem(wx.ID_ANY, "Count")
         self.sort_by_count_id = self.sort_by_count_item.GetId()
 
+        self.sort_menu.AppendSeparator()
+
+        self.sort_by_hue_item = self.sort_menu.AppendCheckItem(wx.ID_ANY, "Hue")
+        self.sort_by_hue_id = self.sort_by_hue_item.GetId()
+
+        self.sort_by_lightness_item = self.sort_menu.AppendCheckItem(wx.ID_ANY, "Lightness")
+        self.sort_by_lightness_id = self.sort_by_lightness_item.GetId()
+
+        self.sort_by_saturation_item = self.sort_menu.AppendCheckItem(wx.ID_ANY, "Saturation")
+        self.sort_by_saturation_id = self.sort_by_saturation_item.GetId()
+
+        self.sort_by_gradient_item = self.sort_menu.AppendCheckItem(wx.ID_ANY, "Color Gradient")
+        self.sort_by_gradient_id = self.sort_by_gradient_item.GetId()
+
         if self.model.sort_method == self.SORT_BY_BRAND:
             self.sort_by_brand_item.Check()
         elif self.model.sort_method == self.SORT_BY_SKU:
             self.sort_by_sku_item.Check()
         elif self.model.sort_method == self.SORT_BY_NAME:
             self.sort_by_name_item.Check()
+        elif self.model.sort_method == self.SORT_BY_HUE:
+            self.sort_by_hue_item.Check()
+        elif self.model.sort_method == self.SORT_BY_LIGHTNESS:
+            self.sort_by_lightness_item.Check()
+        elif self.model.sort_method == self.SORT_BY_SATURATION:
+            self.sort_by_saturation_item.Check()
+        elif self.model.sort_method == self.SORT_BY_GRADIENT:
+            self.sort_by_gradient_item.Check()
         else:
             self.sort_by_count_item.Check()
 
@@ -270,6 +311,10 @@ class Window(wx.Frame):
         self.Bind(wx.EVT_MENU, self.sort_skeins, self.sort_by_sku_item)
         self.Bind(wx.EVT_MENU, self.sort_skeins, self.sort_by_name_item)
         self.Bind(wx.EVT_MENU, self.sort_skeins, self.sort_by_count_item)
+        self.Bind(wx.EVT_MENU, self.sort_skeins, self.sort_by_hue_item)
+        self.Bind(wx.EVT_MENU, self.sort_skeins, self.sort_by_lightness_item)
+        self.Bind(wx.EVT_MENU, self.sort_skeins, self.sort_by_saturation_item)
+        self.Bind(wx.EVT_MENU, self.sort_skeins, self.sort_by_gradient_item)
 
         SkeinPanel.COUNT_CHANGE = self.update_skein_count
         SkeinPanel.EDIT_SKEIN = self.edit_skein
@@ -286,6 +331,19 @@ class Window(wx.Frame):
         self.Bind(wx.EVT_MENU, self.on_about, about_item)
         menubar.Append(help_menu, "&Help")
 
+        # Hidden unless launched with SKEINCARE_DEBUG=1
+        if debug.ENABLED:
+            debug_menu = wx.Menu()
+            latency_item = debug_menu.Append(wx.ID_ANY, "&Latency Report")
+            self.Bind(wx.EVT_MENU, self.on_latency_report, latency_item)
+            self.latency_hud_item = debug_menu.AppendCheckItem(wx.ID_ANY, "Latency &HUD")
+            self.Bind(wx.EVT_MENU, self.on_latency_hud, self.latency_hud_item)
+            memory_item = debug_menu.Append(wx.ID_ANY, "&Memory Report")
+            self.Bind(wx.EVT_MENU, self.on_memory_report, memory_item)
+            menubar.Append(debug_menu, "&Debug")
+            self.hud_timer = wx.Timer(self)
+            self.Bind(wx.EVT_TIMER, self.on_latency_hud_timer, self.hud_timer)
+
         self.SetMenuBar(menubar)
         self.CreateStatusBar()
         # Add skein counter above search bar
@@ -340,6 +398,7 @@ class Window(wx.Frame):
                 return menu_item.GetId()
         return -1
 
+    @debug.timed("Window.populate_grid")
     def populate_grid(self):
         # Get visible panels
         panel_list = [(key, panel) for key, panel in self.skein_panels.items()]
@@ -353,6 +412,14 @@ class Window(wx.Frame):
             panel_list.sort(key=lambda x: x[1].skein.name.lower())
         elif sort_id == self.sort_by_count_id:  # Sort by count
             panel_list.sort(key=lambda x: x[1].count, reverse=True)
+        elif sort_id == self.sort_by_hue_id:  # Sort by hue, greys first
+            panel_list.sort(key=lambda x: x[1].skein.color_keys.hue)
+        elif sort_id == self.sort_by_lightness_id:  # Sort by lightness
+            panel_list.sort(key=lambda x: x[1].skein.color_keys.lightness)
+        elif sort_id == self.sort_by_saturation_id:  # Sort by saturation, most vivid first
+            panel_list.sort(key=lambda x: x[1].skein.color_keys.saturation, reverse=True)
+        elif sort_id == self.sort_by_gradient_id:  # Sort along a Hilbert curve through CIELAB
+            panel_list.sort(key=lambda x: x[1].skein.color_keys.gradient)
 
         # Freeze the window to prevent flickering
         self.scroll.Freeze()
@@ -376,6 +443,7 @@ class Window(wx.Frame):
         self.grid_sizer.Clear(True)
         self.skein_panels.clear()
 
+    @debug.timed("Window.update_panel_visibility")
     def update_panel_visibility(self):
         # Variables to track skein counts
         total_skeins = 0
@@ -383,11 +451,10 @@ class Window(wx.Frame):
 
         is_show_all_skeins = not self.toggle_item.IsChecked()
         search_text = self.search_bar.GetValue().lower()
+        read_only = self.model.profiles.read_only
         for brand, brand_skeins in self.model.catalog.skeins.items():
             for sku, skein in brand_skeins.items():
-                count = 0
-                if brand in self.model.library and sku in self.model.library[brand]:
-                    count = self.model.library[brand][sku]
+                count = self.model.get_count(brand, sku)
 
                 total_skeins += count
                 unique_skeins += 1
@@ -398,7 +465,10 @@ class Window(wx.Frame):
                 panel = self.skein_panels[(brand, sku)]
                 if panel.count != count:
                     panel.count = count
-                    panel.value_text.SetValue(str(count))
+                    # ChangeValue does not echo a count change event back to the model
+                    panel.value_text.ChangeValue(str(count))
+                if panel.read_only != read_only:
+                    panel.set_read_only(read_only)
 
                 if (not is_show_all_skeins and panel.count == 0) or (search_text and not (search_text in sku.lower() or search_text in skein.name.lower())):
                     panel.Hide()
@@ -411,13 +481,17 @@ class Window(wx.Frame):
 
     def sort_skeins(self, event):
         id = event.GetId()
-        # Brand, Sku, Name, Count
+        # Brand, Sku, Name, Count, Hue, Lightness, Saturation, Gradient
 
         # Uncheck all sort menu items
         self.sort_by_brand_item.Check(False)
         self.sort_by_sku_item.Check(False)
         self.sort_by_name_item.Check(False)
         self.sort_by_count_item.Check(False)
+        self.sort_by_hue_item.Check(False)
+        self.sort_by_lightness_item.Check(False)
+        self.sort_by_saturation_item.Check(False)
+        self.sort_by_gradient_item.Check(False)
 
         if id == self.sort_by_brand_id:
             self.model.sort_method = self.SORT_BY_BRAND  # Sort by brand
@@ -431,6 +505,18 @@ class Window(wx.Frame):
         elif id == self.sort_by_count_id:
             self.model.sort_method = self.SORT_BY_COUNT  # Sort by count
             self.sort_by_count_item.Check(True)
+        elif id == self.sort_by_hue_id:
+            self.model.sort_method = self.SORT_BY_HUE  # Sort by hue
+            self.sort_by_hue_item.Check(True)
+        elif id == self.sort_by_lightness_id:
+            self.model.sort_method = self.SORT_BY_LIGHTNESS  # Sort by lightness
+            self.sort_by_lightness_item.Check(True)
+        elif id == self.sort_by_saturation_id:
+            self.model.sort_method = self.SORT_BY_SATURATION  # Sort by saturation
+            self.sort_by_saturation_item.Check(True)
+        elif id == self.sort_by_gradient_id:
+            self.model.sort_method = self.SORT_BY_GRADIENT  # Sort by colour gradient
+            self.sort_by_gradient_item.Check(True)
         else:
             raise ValueError("Invalid sort id.")
 
@@ -458,6 +544,25 @@ class Window(wx.Frame):
                 self.populate_grid()
         dialog.Destroy()
 
+    def on_patterns(self, event):
+        # Dialogs outside the main grid are imported on first use to keep launch fast
+        from ui.pattern import PatternDialog
+        dialog = PatternDialog(self, self.model, self.pattern_queue)
+        dialog.ShowModal()
+        dialog.Destroy()
+
+    def on_gradient(self, event):
+        from ui.planner import GradientDialog
+        dialog = GradientDialog(self, self.model)
+        dialog.ShowModal()
+        dialog.Destroy()
+
+    def on_usage(self, event):
+        from ui.usage import UsageDialog
+        dialog = UsageDialog(self, self.model)
+        dialog.ShowModal()
+        dialog.Destroy()
+
     def edit_skein(self, skein: Skein):
         """Edit a skein and return True if the skein was deleted, False otherwise."""
         dialog = EditSkeinDialog(self, self.model, skein)
@@ -500,6 +605,167 @@ class Window(wx.Frame):
         # Update the skein counter to reflect the new count
         self.update_panel_visibility()
 
+    def handle_command(self, request: dict):
+        """Apply a request from a later launch or a script, called on the UI thread by the instance server"""
+        op = request.get("op")
+        if op == "focus":
+            self.Iconize(False)
+            self.Show()
+            self.Raise()
+            self.RequestUserAttention()
+            return None
+        if op == "search":
+            # ChangeValue skips the text event, the grid is rebuilt once in finish_commands
+            self.search_bar.ChangeValue(str(request.get("text", "")))
+            self.remote_regrid = True
+            return None
+        if op in ("get", "adjust", "set"):
+            brand, sku = str(request.get("brand", "")).lower(), str(request.get("sku", ""))
+            if sku not in self.model.catalog.skeins.get(brand, {}):
+                raise KeyError(f"unknown skein {brand} {sku}")
+            # Counts go to the active profile unless the request names one
+            profile = request.get("profile")
+            count = self.model.get_count(brand, sku, profile)
+            if op == "get":
+                return count
+            if op == "adjust":
+                count = max(0, count + int(request["delta"]))
+            else:
+                count = int(request["count"])
+                if count < 0:
+                    raise ValueError("count must not be negative")
+            self.model.update_skein_count(brand, sku, count, profile=profile)
+            self.remote_status = f"Updated skein count for {brand} - {sku} to {count}"
+            return count
+        if op == "batch":
+            results = []
+            for item in request.get("requests", []):
+                try:
+                    results.append(self.handle_command(item))
+                except Exception as e:
+                    results.append({"error": str(e) or type(e).__name__})
+            return results
+        raise ValueError(f"unknown op '{op}'")
+
+    def finish_commands(self):
+        """Refresh the grid once after a batch of remote requests"""
+        if self.remote_status:
+            self.SetStatusText(self.remote_status)
+            self.remote_status = None
+        self.update_panel_visibility()
+        if self.remote_regrid:
+            self.remote_regrid = False
+            self.populate_grid()
+
+    def build_profile_menu(self):
+        for item in list(self.profile_menu.GetMenuItems()):
+            self.profile_menu.Delete(item)
+
+        for name in self.model.profiles.names() + [ALL_PROFILES]:
+            if name == ALL_PROFILES:
+                self.profile_menu.AppendSeparator()
+            item = self.profile_menu.AppendRadioItem(wx.ID_ANY, name)
+            item.Check(name == self.model.profiles.active)
+            self.Bind(wx.EVT_MENU, lambda event, name=name: self.switch_profile(name), item)
+
+        self.profile_menu.AppendSeparator()
+        new_item = self.profile_menu.Append(wx.ID_ANY, "New Profile...")
+        self.Bind(wx.EVT_MENU, self.on_new_profile, new_item)
+        rename_item = self.profile_menu.Append(wx.ID_ANY, "Rename Profile...")
+        self.Bind(wx.EVT_MENU, self.on_rename_profile, rename_item)
+        delete_item = self.profile_menu.Append(wx.ID_ANY, "Delete Profile")
+        self.Bind(wx.EVT_MENU, self.on_delete_profile, delete_item)
+        transfer_item = self.profile_menu.Append(wx.ID_ANY, "Transfer Skeins...")
+        self.Bind(wx.EVT_MENU, self.on_transfer, transfer_item)
+
+        # The summed view has nothing to rename or delete
+        read_only = self.model.profiles.read_only
+        rename_item.Enable(not read_only)
+        delete_item.Enable(not read_only and len(self.model.profiles.names()) > 1)
+        transfer_item.Enable(len(self.model.profiles.names()) > 1)
+        self.SetTitle(f"Skein Care - {self.model.profiles.active}")
+
+    def switch_profile(self, name):
+        # Counts for every profile are already in memory, only the grid is refreshed
+        self.model.switch_profile(name)
+        self.build_profile_menu()
+        self.SetStatusText(f"Showing {name}")
+        self.update_panel_visibility()
+        self.populate_grid()
+
+    def on_new_profile(self, event):
+        name = wx.GetTextFromUser("Name of the new profile:", "New Profile", parent=self)
+        if not name:
+            return
+        try:
+            self.model.create_profile(name)
+        except ValueError as e:
+            wx.MessageBox(str(e), "New Profile", wx.OK | wx.ICON_ERROR)
+            return
+        self.switch_profile(name.strip())
+
+    def on_rename_profile(self, event):
+        old = self.model.profiles.active
+        name = wx.GetTextFromUser("New name for the profile:", "Rename Profile", old, parent=self)
+        if not name or name == old:
+            return
+        try:
+            self.model.rename_profile(old, name)
+        except ValueError as e:
+            wx.MessageBox(str(e), "Rename Profile", wx.OK | wx.ICON_ERROR)
+            return
+        self.build_profile_menu()
+
+    def on_delete_profile(self, event):
+        name = self.model.profiles.active
+        if wx.MessageBox(f"Delete the profile '{name}' and all of its counts?\nThis cannot be undone.",
+                         "Delete Profile", wx.YES_NO | wx.ICON_WARNING) != wx.YES:
+            return
+        try:
+            self.model.remove_profile(name)
+        except ValueError as e:
+            wx.MessageBox(str(e), "Delete Profile", wx.OK | wx.ICON_ERROR)
+            return
+        self.switch_profile(self.model.profiles.active)
+
+    def on_transfer(self, event):
+        from ui.profile import TransferDialog
+        dialog = TransferDialog(self, self.model)
+        if dialog.ShowModal() == wx.ID_OK:
+            self.SetStatusText(dialog.summary)
+            self.update_panel_visibility()
+            self.populate_grid()
+        dialog.Destroy()
+
+    def on_undo(self, event):
+        self.apply_history_entry(self.model.undo_last, "Undo", "Undid")
+
+    def on_redo(self, event):
+        self.apply_history_entry(self.model.redo_last, "Redo", "Redid")
+
+    def apply_history_entry(self, step, name, action):
+        try:
+            entry = step()
+        except ValueError as e:
+            self.SetStatusText(f"{name} failed: {e}")
+            return
+        if entry is None:
+            return
+        if isinstance(entry, (CountChange, TransferChange)):
+            self.SetStatusText(f"{action} count change for {entry.brand} - {entry.sku}")
+            self.update_panel_visibility()
+            return
+
+        # Only the affected skein's panel is rebuilt
+        snapshot = entry.before or entry.after
+        key = (snapshot['brand'], snapshot['sku'])
+        if key in self.skein_panels:
+            self.skein_panels[key].Destroy()
+            del self.skein_panels[key]
+        self.SetStatusText(f"{action} change to {key[0]} - {key[1]}")
+        self.update_panel_visibility()
+        self.populate_grid()
+
     def on_resize(self, event):
         # Allow the event to propagate
         event.Skip()
@@ -523,6 +789,8 @@ class Window(wx.Frame):
 
     def on_about(self, event):
         """Display the about dialog when the About menu item is clicked."""
+        import wx.adv
+        from about import LICENCE
         info = wx.adv.AboutDialogInfo()
         info.SetName("Skein Care")
         info.SetVersion(updater.VERSION)
@@ -532,7 +800,31 @@ class Window(wx.Frame):
         info.SetWebSite(updater.KO_FI_URL)
         wx.adv.AboutBox(info)
 
+    def on_latency_report(self, event):
+        from ui.debug import LatencyDialog
+        dialog = LatencyDialog(self)
+        dialog.ShowModal()
+        dialog.Destroy()
+
+    def on_memory_report(self, event):
+        from ui.debug import MemoryDialog
+        dialog = MemoryDialog(self, self.model)
+        dialog.ShowModal()
+        dialog.Destroy()
+
+    def on_latency_hud(self, event):
+        if self.latency_hud_item.IsChecked():
+            self.hud_timer.Start(500)
+        else:
+            self.hud_timer.Stop()
+            self.SetStatusText("")
+
+    def on_latency_hud_timer(self, event):
+        from ui.debug import latency_hud_text
+        self.SetStatusText(latency_hud_text())
+
     def on_readme(self, event):
+        from about import DOCS
         dialog = wx.Dialog(self, title="Documentation", size=(800, 500))
         sizer = wx.BoxSizer(wx.VERTICAL)
         text_ctrl = wx.TextCtrl(dialog, style=wx.TE_MULTILINE | wx.TE_READONLY | wx.TE_RICH2)
@@ -556,58 +848,20 @@ class Window(wx.Frame):
             sort_method = self.SORT_BY_NAME
         elif sort_id == self.sort_by_count_id:
             sort_method = self.SORT_BY_COUNT
+        elif sort_id == self.sort_by_hue_id:
+            sort_method = self.SORT_BY_HUE
+        elif sort_id == self.sort_by_lightness_id:
+            sort_method = self.SORT_BY_LIGHTNESS
+        elif sort_id == self.sort_by_saturation_id:
+            sort_method = self.SORT_BY_SATURATION
+        elif sort_id == self.sort_by_gradient_id:
+            sort_method = self.SORT_BY_GRADIENT
 
         self.defaults.update({
                 "window_size": (self.GetClientSize().x, self.GetClientSize().y),
                 "window_position": (self.GetPosition().x, self.GetPosition().y),
                 "sort_method": sort_method
         })
+        self.color_card.cancel()
         event.Skip()
 
-
-DOCS = """\
-Skein Care is a native desktop application designed to help catalog thread skeins for embroidery, cross-stitch, and other fiber arts.
-
-- Each skein has a counter that you can adjust using the + and - buttons, or by entering a value directly.
-- Sort collection by Brand, SKU, Name, or Count using the Sort menu.
-- Use the search bar to quickly find skeins by SKU or name.
-
-### Adding New Skeins
-1. Click on "File" > "Add New Skein"
-2. Enter details:
-   - Brand: The manufacturer of the skein
-   - SKU: The product code/number
-   - Name: The color name or description
-   - Colors: Add one or more colors for the skein
-3. Click "OK" to add the skein to your catalog
-
-### Data Management
-- Click on any skein in your collection to edit its details
-- Skein collection is saved in "library.json"
-- Skein catalogs are stored in the "catalogs"
-- User preferences are saved in "defaults.json"
-"""
-
-LICENCE = """\
-MIT License
-
-Copyright (c) 2025 Jaylin Wylie Mayes
-
-Permission is hereby granted, free of charge, to any person obtaining a copy
-of this software and associated documentation files (the "Software"), to deal
-in the Software without restriction, including without limitation the rights
-to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
-copies of the Software, and to permit persons to whom the Software is
-furnished to do so, subject to the following conditions:
-
-The above copyright notice and this permission notice shall be included in all
-copies or substantial portions of the Software.
-
-THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
-IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
-FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
-AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
-LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
-OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
-SOFTWARE.
-"""
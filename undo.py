@@ -0,0 +1,125 @@
+import sys
+import time
+from collections import deque
+
+
+class CountChange:
+    __slots__ = ('brand', 'sku', 'old', 'new', 'time', 'profile')
+
+    def __init__(self, brand: str, sku: str, old: int, new: int, profile: str | None = None):
+        self.brand = brand
+        self.sku = sku
+        self.old = old
+        self.new = new
+        self.time = time.monotonic()
+        # Undo applies to the profile the change was made in, whichever is active by then
+        self.profile = profile
+
+    def size(self) -> int:
+        return sys.getsizeof(self) + sys.getsizeof(self.brand) + sys.getsizeof(self.sku)
+
+
+class TransferChange:
+    __slots__ = ('brand', 'sku', 'amount', 'source', 'target')
+
+    def __init__(self, brand: str, sku: str, amount: int, source: str, target: str):
+        self.brand = brand
+        self.sku = sku
+        self.amount = amount
+        self.source = source
+        self.target = target
+
+    def size(self) -> int:
+        return sys.getsizeof(self) + sys.getsizeof(self.brand) + sys.getsizeof(self.sku)
+
+
+class SkeinChange:
+    """An add (before is None), edit, or delete (after is None) of a catalog skein.
+
+    Snapshots are plain dicts from Skein.to_dict, counts are the profile counts lost on delete.
+    """
+
+    __slots__ = ('before', 'after', 'counts')
+
+    def __init__(self, before: dict | None, after: dict | None, counts: dict[str, int] | None = None):
+        self.before = before
+        self.after = after
+        self.counts = counts or {}
+
+    def size(self) -> int:
+        total = sys.getsizeof(self)
+        for snapshot in (self.before, self.after):
+            if snapshot:
+                total += sys.getsizeof(snapshot) + sum(sys.getsizeof(value) for value in snapshot.values())
+                total += sum(sys.getsizeof(color) for color in snapshot['color'])
+        return total + sys.getsizeof(self.counts)
+
+
+class UndoStack:
+    # Count changes to the same skein closer together than this are merged into one entry
+    COALESCE_SECONDS = 1.0
+
+    def __init__(self, max_entries: int = 500, max_bytes: int = 512 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.undo_entries: deque = deque()
+        self.redo_entries: list = []
+        # Both stacks count toward max_bytes, an entry keeps its size as it moves between them
+        self.bytes = 0
+
+    def can_undo(self) -> bool:
+        return bool(self.undo_entries)
+
+    def can_redo(self) -> bool:
+        return bool(self.redo_entries)
+
+    def clear(self):
+        self.undo_entries.clear()
+        self.redo_entries.clear()
+        self.bytes = 0
+
+    def clear_redo(self):
+        self.bytes -= sum(entry.size() for entry in self.redo_entries)
+        self.redo_entries.clear()
+
+    def push(self, entry):
+        self.clear_redo()
+        self.undo_entries.append(entry)
+        self.bytes += entry.size()
+
+        # Forget the oldest entries once over either cap
+        while self.undo_entries and (len(self.undo_entries) > self.max_entries or self.bytes > self.max_bytes):
+            self.bytes -= self.undo_entries.popleft().size()
+
+    def record_count(self, brand: str, sku: str, old: int, new: int, profile: str | None = None):
+        if self.undo_entries:
+            last = self.undo_entries[-1]
+            if (isinstance(last, CountChange) and last.brand == brand and last.sku == sku and last.profile == profile
+                    and time.monotonic() - last.time < self.COALESCE_SECONDS):
+                last.new = new
+                last.time = time.monotonic()
+                self.clear_redo()
+                if last.new == last.old:
+                    self.bytes -= self.undo_entries.pop().size()
+                return
+        self.push(CountChange(brand, sku, old, new, profile))
+
+    def record_skein(self, before: dict | None, after: dict | None, counts: dict[str, int] | None = None):
+        self.push(SkeinChange(before, after, counts))
+
+    def record_transfer(self, brand: str, sku: str, amount: int, source: str, target: str):
+        self.push(TransferChange(brand, sku, amount, source, target))
+
+    def pop_undo(self):
+        if not self.undo_entries:
+            return None
+        entry = self.undo_entries.pop()
+        self.redo_entries.append(entry)
+        return entry
+
+    def pop_redo(self):
+        if not self.redo_entries:
+            return None
+        entry = self.redo_entries.pop()
+        self.undo_entries.append(entry)
+        return entry
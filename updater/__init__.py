@@ -1,5 +1,13 @@
-from .update import check_for_updates
-from .gui import check_for_updates_dialog
-
 VERSION = "v1.1.0"
 KO_FI_URL = "https://ko-fi.com/s/011d38ab3b"
+
+
+def __getattr__(name):
+    # The update modules pull in requests, so they are only imported once an update check runs
+    if name == "check_for_updates":
+        from .update import check_for_updates
+        return check_for_updates
+    if name == "check_for_updates_dialog":
+        from .gui import check_for_updates_dialog
+        return check_for_updates_dialog
+    raise AttributeError(f"module 'updater' has no attribute '{name}'")
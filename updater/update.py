@@ -1,6 +1,6 @@
 import os
-import requests
 
+import debug
 import updater
 
 USER_REPO = "jaylinwylie/skeincare"
@@ -19,7 +19,9 @@ def is_newer_version(current: tuple, latest: tuple):
     return False
 
 
+@debug.timed("updater.query_latest")
 def query_latest() -> dict:
+    import requests
     url = f"https://api.github.com/repos/{USER_REPO}/releases/latest"
     response = requests.get(url, timeout=10)  # Add timeout to prevent hanging
     if response.status_code == 200:
@@ -0,0 +1,244 @@
+import atexit
+import bisect
+import contextlib
+import mmap
+import os
+import struct
+import time
+
+from profiles import ALL_PROFILES, DEFAULT_PROFILE
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# timestamp, key id, new count, change; all 32-bit so each column can be read as a strided view
+RECORD = struct.Struct('<IIii')
+# Set in the key id of a record written by an undo, which takes back an earlier change
+REVERSAL = 0x80000000
+RECORD_DTYPE = [('timestamp', '<u4'), ('key_id', '<u4'), ('count', '<i4'), ('change', '<i4')]
+FIELDS = 4
+DAY = 86400
+
+
+class UsageHistory:
+    """Append-only log of every count change.
+
+    Records are fixed width and written in time order to `path`, the brand, SKU and profile
+    for each key id are a line in `path` + '.keys'. Writes are buffered so the +/- click path
+    only packs a few bytes.
+    """
+
+    FLUSH_EVERY = 64
+
+    def __init__(self, path: str = "usage.bin"):
+        self.path = path
+        self.keys_path = path + ".keys"
+        self.keys: list[tuple[str, str, str]] = []
+        self.key_ids: dict[tuple[str, str, str], int] = {}
+        self.pending: list[bytes] = []
+        self.file = None
+        # Buffered records still reach the file if the app exits on an unhandled error
+        atexit.register(self.close)
+
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path, 'r') as f:
+                for line in f:
+                    fields = line.rstrip('\n').split('\t', 2)
+                    # Logs from before profiles have no profile column, their counts became the default profile
+                    key = (fields[0], fields[1], fields[2] if len(fields) > 2 else DEFAULT_PROFILE)
+                    self.key_ids[key] = len(self.keys)
+                    self.keys.append(key)
+
+    def key_id(self, brand: str, sku: str, profile: str) -> int:
+        key = (brand, sku, profile)
+        key_id = self.key_ids.get(key)
+        if key_id is None:
+            key_id = self.key_ids[key] = len(self.keys)
+            self.keys.append(key)
+            with open(self.keys_path, 'a') as f:
+                f.write(f"{brand}\t{sku}\t{profile}\n")
+        return key_id
+
+    def rename_profile(self, old: str, new: str):
+        """Move the history of a renamed profile to its new name, records keep their key ids."""
+        self.keys = [(brand, sku, new if profile == old else profile) for brand, sku, profile in self.keys]
+        self.key_ids = {key: key_id for key_id, key in enumerate(self.keys)}
+        temporary = self.keys_path + ".tmp"
+        with open(temporary, 'w') as f:
+            f.writelines(f"{brand}\t{sku}\t{profile}\n" for brand, sku, profile in self.keys)
+        os.replace(temporary, self.keys_path)
+
+    def record(self, brand: str, sku: str, old: int, new: int, timestamp: float | None = None, reversal: bool = False,
+               profile: str = DEFAULT_PROFILE):
+        if timestamp is None:
+            timestamp = time.time()
+        key_id = self.key_id(brand, sku, profile) | (REVERSAL if reversal else 0)
+        self.pending.append(RECORD.pack(int(timestamp), key_id, new, new - old))
+        if len(self.pending) >= self.FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        if self.file is None:
+            self.file = open(self.path, 'ab')
+        self.file.write(b''.join(self.pending))
+        self.file.flush()
+        self.pending.clear()
+
+    def close(self):
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    @contextlib.contextmanager
+    def mapped(self):
+        """Memory-map the log for the length of the block as a byte view of whole records.
+
+        Views taken from it must not outlive the block, the map is closed on the way out.
+        """
+        self.flush()
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < RECORD.size:
+            yield memoryview(b'')
+            return
+
+        with open(self.path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)[:len(mapped) - len(mapped) % RECORD.size]
+        try:
+            yield view
+        finally:
+            view.release()
+            mapped.close()
+
+    @staticmethod
+    def columns(view: memoryview):
+        """(timestamps, key ids, changes) as strided views over a mapped log"""
+        unsigned = view.cast('I')
+        signed = view.cast('i')
+        return unsigned[0::FIELDS], unsigned[1::FIELDS], signed[3::FIELDS]
+
+
+class UsageRow:
+    def __init__(self, brand: str, sku: str):
+        self.brand = brand
+        self.sku = sku
+        self.count = 0
+        self.used_total = 0
+        self.used_recent = 0
+        self.used_long = 0
+        # Days of history behind used_long, shorter than the long window for newly tracked skeins
+        self.history_days = float(UsageAnalytics.LONG_DAYS)
+        self.now = 0.0
+
+    @property
+    def daily_rate(self) -> float:
+        return self.used_long / self.history_days
+
+    @property
+    def run_out(self) -> float | None:
+        """Projected timestamp when the count reaches zero at the long-window rate"""
+        if self.daily_rate <= 0:
+            return None
+        return self.now + self.count / self.daily_rate * DAY
+
+
+class UsageAnalytics:
+    RECENT_DAYS = 30
+    LONG_DAYS = 90
+
+    @classmethod
+    def consumption(cls, history: UsageHistory, model, now: float | None = None,
+                    profile: str | None = None) -> list[UsageRow]:
+        """Per-SKU consumption totals over 30 and 90 day windows plus all-time, soonest run-out first.
+
+        Usage and counts are those of one profile, the active one by default. ALL_PROFILES sums
+        the usage of every profile and projects it against their combined counts.
+        """
+        if now is None:
+            now = time.time()
+        if profile is None:
+            profile = model.profiles.active
+        with history.mapped() as view:
+            if numpy is not None:
+                totals, recent, long, first = cls.aggregate_numpy(view, len(history.keys), now)
+            else:
+                totals, recent, long, first = cls.aggregate_python(view, len(history.keys), now)
+
+        rows: dict[tuple[str, str], UsageRow] = {}
+        first_used: dict[tuple[str, str], float] = {}
+        for key_id, (brand, sku, key_profile) in enumerate(history.keys):
+            if not totals[key_id] or (profile != ALL_PROFILES and key_profile != profile):
+                continue
+            row = rows.get((brand, sku))
+            if row is None:
+                row = rows[(brand, sku)] = UsageRow(brand, sku)
+                row.count = model.get_count(brand, sku, profile)
+                row.now = now
+                first_used[(brand, sku)] = first[key_id]
+            row.used_total += totals[key_id]
+            row.used_recent += recent[key_id]
+            row.used_long += long[key_id]
+            first_used[(brand, sku)] = min(first_used[(brand, sku)], first[key_id])
+
+        for key, row in rows.items():
+            row.history_days = max(1.0, min(cls.LONG_DAYS, (now - first_used[key]) / DAY))
+        return sorted(rows.values(), key=lambda row: (row.run_out is None, row.run_out or 0, -row.used_total))
+
+    @classmethod
+    def aggregate_numpy(cls, view: memoryview, keys: int, now: float):
+        """(all-time used, recent used, long used, first record time) per key id, as whole-array operations"""
+        if not view.nbytes:
+            return [0] * keys, [0] * keys, [0] * keys, [0] * keys
+        records = numpy.frombuffer(view, dtype=RECORD_DTYPE)
+        timestamps = records['timestamp']
+        key_ids = (records['key_id'] & ~numpy.uint32(REVERSAL)).astype(numpy.intp)
+        changes = records['change'].astype(numpy.int64)
+        # A reversal of a decrement gives the skeins back, one of an increment uses nothing
+        used = numpy.where(records['key_id'] & REVERSAL, -numpy.maximum(changes, 0), numpy.maximum(-changes, 0))
+
+        # Records are appended in time order, so each window is a tail of the log
+        recent_start = numpy.searchsorted(timestamps, now - cls.RECENT_DAYS * DAY)
+        long_start = numpy.searchsorted(timestamps, now - cls.LONG_DAYS * DAY)
+
+        def window_sum(start):
+            totals = numpy.bincount(key_ids[start:], weights=used[start:], minlength=keys).astype(numpy.int64)
+            # An undo just inside a window can take back a change from before it
+            return numpy.maximum(totals, 0).tolist()
+
+        first = numpy.zeros(keys, dtype=numpy.int64)
+        seen, first_index = numpy.unique(key_ids, return_index=True)
+        first[seen] = timestamps[first_index]
+        return window_sum(0), window_sum(recent_start), window_sum(long_start), first.tolist()
+
+    @classmethod
+    def aggregate_python(cls, view: memoryview, keys: int, now: float):
+        """Same as aggregate_numpy with a loop over the records, for when NumPy is not installed"""
+        timestamps, key_ids, changes = UsageHistory.columns(view)
+        recent_start = bisect.bisect_left(timestamps, now - cls.RECENT_DAYS * DAY)
+        long_start = bisect.bisect_left(timestamps, now - cls.LONG_DAYS * DAY)
+
+        totals, recent, long = [0] * keys, [0] * keys, [0] * keys
+        first: list = [None] * keys
+        for index, (timestamp, key_id, change) in enumerate(zip(timestamps.tolist(), key_ids.tolist(), changes.tolist())):
+            if key_id & REVERSAL:
+                key_id &= ~REVERSAL
+                used = -change if change > 0 else 0
+            else:
+                used = -change if change < 0 else 0
+            if first[key_id] is None:
+                first[key_id] = timestamp
+            if used:
+                totals[key_id] += used
+                if index >= long_start:
+                    long[key_id] += used
+                if index >= recent_start:
+                    recent[key_id] += used
+        for view in (timestamps, key_ids, changes):
+            view.release()
+        # An undo just inside a window can take back a change from before it
+        totals, recent, long = ([max(0, used) for used in column] for column in (totals, recent, long))
+        return totals, recent, long, first